@@ -0,0 +1,43 @@
+"""add_client_search_trigram_index
+
+Revision ID: b7c1e4d2a9f3
+Revises: 93df974c4a69
+Create Date: 2026-10-16 10:12:41.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7c1e4d2a9f3'
+down_revision: Union[str, Sequence[str], None] = '93df974c4a69'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # La búsqueda de clientes usa ILIKE '%término%', que un índice btree no
+    # puede aprovechar. En PostgreSQL se agrega un índice trigram sobre el
+    # nombre; en SQLite siguen valiendo idx_client_name / idx_client_phone.
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.execute(
+        'CREATE INDEX IF NOT EXISTS idx_client_name_trgm '
+        'ON clients USING gin (name gin_trgm_ops)'
+    )
+    op.execute(
+        'CREATE INDEX IF NOT EXISTS idx_client_phone_trgm '
+        'ON clients USING gin (phone gin_trgm_ops)'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute('DROP INDEX IF EXISTS idx_client_phone_trgm')
+    op.execute('DROP INDEX IF EXISTS idx_client_name_trgm')
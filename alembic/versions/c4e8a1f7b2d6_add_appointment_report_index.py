@@ -0,0 +1,34 @@
+"""add_appointment_report_index
+
+Revision ID: c4e8a1f7b2d6
+Revises: b7c1e4d2a9f3
+Create Date: 2026-10-16 15:40:27.904113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e8a1f7b2d6'
+down_revision: Union[str, Sequence[str], None] = 'b7c1e4d2a9f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Índice cubriente para los reportes: filtran por rango de start_time y
+    # agrupan por status y barber_id, uniendo con services por service_id.
+    op.create_index(
+        'idx_appointment_report',
+        'appointments',
+        ['start_time', 'status', 'barber_id', 'service_id'],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_appointment_report', table_name='appointments')
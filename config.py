@@ -32,6 +32,35 @@ class DatabaseConfig:
     # Configuración de SQLAlchemy
     ECHO_SQL: bool = os.getenv("ECHO_SQL", "false").lower() == "true"
     
+    # Pool de conexiones (reutiliza conexiones entre sesiones)
+    POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    POOL_RECYCLE_SECONDS: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    
+
+class CacheConfig:
+    """Configuración de cachés persistentes."""
+    
+    # Archivo de la caché de reportes de periodos cerrados (vacío la deshabilita)
+    REPORTS_CACHE_PATH: str = os.getenv("REPORTS_CACHE_PATH", os.path.join(".cache", "reports.sqlite"))
+    REPORTS_CACHE_TTL_SECONDS: int = int(os.getenv("REPORTS_CACHE_TTL", "86400"))
+    
+
+class SecurityConfig:
+    """Configuración de seguridad."""
+    
+    # Costo de bcrypt (log2 de iteraciones). Si no se define, se calibra
+    # al primer uso para respetar BCRYPT_TARGET_MS en el hardware actual.
+    BCRYPT_ROUNDS: Optional[int] = (
+        int(os.environ["BCRYPT_ROUNDS"]) if os.getenv("BCRYPT_ROUNDS") else None
+    )
+    BCRYPT_TARGET_MS: int = int(os.getenv("BCRYPT_TARGET_MS", "100"))
+    
+    # Límites de la calibración automática. BCRYPT_MIN_ROUNDS es además el
+    # costo mínimo de cualquier hash nuevo, aunque BCRYPT_ROUNDS pida menos.
+    BCRYPT_MIN_ROUNDS: int = int(os.getenv("BCRYPT_MIN_ROUNDS", "12"))
+    BCRYPT_MAX_ROUNDS: int = 14
+
 
 class AppConfig:
     """Configuración general de la aplicación."""
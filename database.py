@@ -5,11 +5,13 @@ Maneja la conexión SQLite, fábrica de sesiones e inicialización de datos semi
 import os
 import logging
 from contextlib import contextmanager
-from typing import Generator
+from itertools import chain
+from typing import Callable, Dict, Generator, List
 
 from dotenv import load_dotenv
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import QueuePool
 
 from models.base import Base, Service, Settings, Barber, User
 from config import DatabaseConfig
@@ -19,16 +21,78 @@ load_dotenv()
 
 logger = logging.getLogger("barber_manager.database")
 
+# Opciones del pool: get_db() toma una conexión ya abierta en lugar de crear una nueva
+_pool_options = {
+    "pool_pre_ping": True,
+    "pool_recycle": DatabaseConfig.POOL_RECYCLE_SECONDS,
+}
+if ":memory:" not in DatabaseConfig.DATABASE_URL:
+    # SQLite en memoria requiere su propio pool de una única conexión
+    _pool_options.update(
+        poolclass=QueuePool,
+        pool_size=DatabaseConfig.POOL_SIZE,
+        max_overflow=DatabaseConfig.MAX_OVERFLOW,
+    )
+
 # Crear engine con optimizaciones para SQLite
 engine = create_engine(
     DatabaseConfig.DATABASE_URL,
     echo=DatabaseConfig.ECHO_SQL,
-    connect_args={"check_same_thread": False}  # Requerido para SQLite con hilos
+    connect_args={"check_same_thread": False},  # Requerido para SQLite con hilos
+    **_pool_options
 )
 
 # Fábrica de sesiones
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Fábrica de sesiones de solo lectura: sin commit; los objetos cargados conservan sus atributos al cerrar
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+
+
+# Modelo -> funciones a ejecutar después de cada commit que escribió filas de ese modelo
+_commit_callbacks: Dict[type, List[Callable[[], None]]] = {}
+
+
+def on_commit(model: type, callback: Callable[[], None]) -> None:
+    """
+    Registra callback() para ejecutarse después de cada commit que insertó,
+    modificó o eliminó filas de model, en cualquier sesión.
+    No se ejecuta si la transacción se revierte. Pensado para invalidar cachés:
+    hacerlo antes del commit permitiría que una lectura concurrente guarde
+    datos aún no confirmados como si fueran los nuevos.
+    
+    Args:
+        model: Clase del modelo ORM
+        callback: Función sin argumentos
+    """
+    _commit_callbacks.setdefault(model, []).append(callback)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_models(session: Session, flush_context) -> None:
+    """Anota qué modelos escribió cada flush; se resuelven en after_commit."""
+    changed = session.info.setdefault("changed_models", set())
+    changed.update(type(obj) for obj in chain(session.new, session.dirty, session.deleted))
+
+
+@event.listens_for(Session, "after_commit")
+def _run_commit_callbacks(session: Session) -> None:
+    """Ejecuta una vez los callbacks de los modelos escritos en la transacción confirmada."""
+    changed = session.info.pop("changed_models", None)
+    if not changed:
+        return
+    callbacks = dict.fromkeys(
+        callback for model in changed for callback in _commit_callbacks.get(model, ())
+    )
+    for callback in callbacks:
+        callback()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_models(session: Session) -> None:
+    """Una transacción revertida no invalida nada."""
+    session.info.pop("changed_models", None)
+
 
 @contextmanager
 def get_db() -> Generator[Session, None, None]:
@@ -51,6 +115,28 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+@contextmanager
+def get_read_db() -> Generator[Session, None, None]:
+    """
+    Context manager para sesiones de solo lectura.
+    No hace commit: la transacción se descarta al cerrar (el pool la revierte al
+    recuperar la conexión), evitando el flush y el COMMIT en rutas de consulta
+    frecuentes (búsquedas, listados). Se cierra sin rollback explícito para no
+    expirar los objetos: sus atributos ya cargados siguen accesibles fuera del
+    bloque; las relaciones no cargadas no.
+    No usar para escrituras: los cambios se pierden.
+    
+    Uso:
+        with get_read_db() as db:
+            db.query(Client).all()
+    """
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
 def get_db_session() -> Session:
     """
     Obtiene una nueva sesión de base de datos.
@@ -143,24 +229,38 @@ def _seed_auth() -> None:
             logger.info("Datos semilla: Usuario admin creado con contraseña desde .env")
 
 
+def _ensure_reset_allowed() -> None:
+    """Lanza RuntimeError si el entorno es producción: ahí el reinicio está deshabilitado."""
+    environment = os.getenv("ENVIRONMENT", "development")
+    if environment == "production":
+        raise RuntimeError(
+            "El reinicio de la base de datos está deshabilitado en producción por seguridad.\n"
+            "Si realmente necesitas resetear la base de datos en producción,\n"
+            "hazlo manualmente eliminando el archivo .db"
+        )
+
+
+def reset_database() -> None:
+    """
+    Elimina todas las tablas y las recrea con los datos semilla, sin pedir confirmación.
+    Para la interfaz, que confirma con su propio diálogo; desde la consola usar reset_db().
+    Cualquier error (incluido estar en producción) se propaga al llamador.
+    """
+    _ensure_reset_allowed()
+    logger.warning("Reiniciando base de datos")
+    Base.metadata.drop_all(bind=engine)
+    init_db()
+
+
 def reset_db() -> None:
     """
     Reinicia la base de datos eliminando todas las tablas y recreándolas.
     ¡ADVERTENCIA: Esto eliminará todos los datos!
     
     SOLO PARA DESARROLLO: Esta función está deshabilitada en producción.
-    Requiere confirmación interactiva para prevenir pérdida accidental de datos.
+    Requiere confirmación interactiva por consola para prevenir pérdida accidental de datos.
     """
-    import os
-    
-    # Verificar que no estamos en producción
-    environment = os.getenv("ENVIRONMENT", "development")
-    if environment == "production":
-        raise RuntimeError(
-            "reset_db() está deshabilitado en producción por seguridad.\n"
-            "Si realmente necesitas resetear la base de datos en producción,\n"
-            "hazlo manualmente eliminando el archivo .db"
-        )
+    _ensure_reset_allowed()
     
     # Requiere confirmación explícita
     print("\n" + "="*60)
@@ -184,6 +284,5 @@ def reset_db() -> None:
         return
     
     logger.warning("Usuario confirmó reset de base de datos")
-    Base.metadata.drop_all(bind=engine)
-    init_db()
+    reset_database()
     print("✅ Base de datos reseteada exitosamente.")
@@ -8,13 +8,15 @@ import flet as ft
 
 from config import logger, AppConfig
 from database import init_db
+from services.auth_service import AuthService
+from utils.session import SessionData, get_session
 from views.components.sidebar import create_sidebar
 from views.agenda_view import create_agenda_view
 from views.new_appointment_view import create_new_appointment_view
 from views.clients_view import create_clients_view
 from views.reports_view import create_reports_view
 from views.services_view import create_services_view
-from views.settings_view import create_settings_view
+from views.settings_view import create_settings_view_async
 from views.login_view import create_login_view
 from views.change_password_view import create_change_password_view
 from views.calendar_settings_view import create_calendar_settings_view
@@ -26,6 +28,8 @@ async def main(page: ft.Page):
     """
     # Inicializar base de datos
     init_db()
+    # Calibrar bcrypt en segundo plano para que el primer login no pague la medición
+    page.run_thread(AuthService.get_bcrypt_rounds)
     
     # Configuración de la página
     page.title = "Barber Manager Pro"
@@ -62,8 +66,7 @@ async def main(page: ft.Page):
         Limpia los datos de sesión y redirige al login.
         """
         logger.info("Usuario cerró sesión")
-        if hasattr(page, 'data') and page.data is not None:
-            page.data.clear()
+        page.data = None
         sidebar_container.visible = False
         divider.visible = False
         content_area.content = create_login_view(page, on_login_success)
@@ -78,12 +81,14 @@ async def main(page: ft.Page):
         Callback ejecutado cuando el login es exitoso.
         Recibe user_data como diccionario para evitar DetachedInstanceError.
         """
-        # Usar page.data para el estado de sesión (compatible con Flet 0.80.x)
-        if not hasattr(page, 'data') or page.data is None:
-            page.data = {}
-        page.data["user_id"] = user_data["id"]
-        page.data["is_logged_in"] = True
-        page.data["barber_id"] = user_data["barber_id"]
+        # Único punto donde se crea la sesión: page.data (compatible con Flet 0.80.x)
+        page.data = SessionData(
+            user_data["id"],
+            user_data["username"],
+            user_data["role"],
+            user_data["barber_id"],
+            is_logged_in=True
+        )
         
         # Verificar si debe cambiar contraseña
         if user_data.get("must_change_password", False):
@@ -121,9 +126,8 @@ async def main(page: ft.Page):
 
             # VERIFICACIÓN DE AUTENTICACIÓN
             # Usando page.data para el estado de sesión (compatible con Flet 0.80.x)
-            is_logged_in = False
-            if hasattr(page, 'data') and page.data is not None:
-                is_logged_in = page.data.get("is_logged_in", False)
+            session = get_session(page)
+            is_logged_in = session is not None and session.is_logged_in
             
             if not is_logged_in:
                 sidebar_container.visible = False
@@ -154,7 +158,7 @@ async def main(page: ft.Page):
             elif route == "/calendar_settings":
                 content_area.content = create_calendar_settings_view(page)
             elif route == "/settings":
-                content_area.content = create_settings_view(page)
+                content_area.content = await create_settings_view_async(page)
             else:
                 await page.push_route("/")
                 return
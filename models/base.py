@@ -161,6 +161,9 @@ class Appointment(Base):
         Index('idx_appointment_start_time', 'start_time'),
         Index('idx_appointment_barber_date', 'barber_id', 'start_time'),
         Index('idx_appointment_status', 'status'),
+        # Reportes: rango de fechas agrupado por estado y barbero; incluye
+        # service_id para unir con el precio sin leer la fila del turno
+        Index('idx_appointment_report', 'start_time', 'status', 'barber_id', 'service_id'),
     )
     
     def __repr__(self) -> str:
@@ -123,6 +123,10 @@ class AppointmentRepository(BaseRepository[Appointment]):
         """
         Obtiene estadísticas resumidas agrupadas por estado del turno.
         
+        Se apoya en el índice cubriente idx_appointment_report
+        (start_time, status, barber_id, service_id): sin él cada reporte
+        recorre la tabla de turnos.
+        
         Args:
             db: Sesión de base de datos
             start_date: Fecha de inicio
@@ -131,49 +135,62 @@ class AppointmentRepository(BaseRepository[Appointment]):
         Retorna:
             Diccionario con estadísticas por estado (confirmed, pending, cancelled)
         """
+        from sqlalchemy import func
+        from models.base import Service
+        
         start_dt = datetime.combine(start_date, datetime.min.time())
         end_dt = datetime.combine(end_date, datetime.max.time())
         
-        appointments = db.query(Appointment).options(
-            joinedload(Appointment.service)
-        ).filter(
+        # Agrupar por estado en la base de datos en lugar de cargar cada turno
+        rows = db.query(
+            Appointment.status,
+            func.count(Appointment.id),
+            func.sum(Service.price)
+        ).join(Service, Appointment.service_id == Service.id)\
+         .filter(
             Appointment.start_time >= start_dt,
             Appointment.start_time <= end_dt
-        ).all()
+        ).group_by(Appointment.status).all()
         
-        # Agrupar por estado
-        confirmed = [a for a in appointments if a.status == "confirmed"]
-        pending = [a for a in appointments if a.status == "pending"]
-        cancelled = [a for a in appointments if a.status == "cancelled"]
+        counts = {status: count for status, count, _ in rows}
+        income = {status: price_sum or 0.0 for status, _, price_sum in rows}
         
         return {
             "confirmed": {
-                "count": len(confirmed),
-                "income": sum(a.service.price for a in confirmed)
+                "count": counts.get("confirmed", 0),
+                "income": income.get("confirmed", 0.0)
             },
             "pending": {
-                "count": len(pending),
-                "income": sum(a.service.price for a in pending)
+                "count": counts.get("pending", 0),
+                "income": income.get("pending", 0.0)
             },
             "cancelled": {
-                "count": len(cancelled),
+                "count": counts.get("cancelled", 0),
                 "income": 0.0
             },
             "total": {
-                "count": len(appointments),
-                "income": sum(a.service.price for a in confirmed)  # Solo confirmados cuenta
+                "count": sum(counts.values()),
+                "income": income.get("confirmed", 0.0)  # Solo confirmados cuenta
             }
         }
 
-    def get_barber_performance(self, db: Session, start_date: date, end_date: date, status: str = None) -> List[dict]:
+    def get_barber_performance(
+        self,
+        db: Session,
+        start_date: date,
+        end_date: date,
+        status: str = None,
+        limit: Optional[int] = None
+    ) -> List[dict]:
         """
-        Obtiene estadísticas por barbero.
+        Obtiene estadísticas por barbero, ordenadas por ingresos de mayor a menor.
         
         Args:
             db: Sesión de base de datos
             start_date: Fecha de inicio
             end_date: Fecha de fin
             status: Filtrar por estado específico (opcional)
+            limit: Cantidad máxima de barberos a retornar (opcional)
             
         Retorna:
             Lista de diccionarios con nombre, conteo e ingresos por barbero
@@ -184,11 +201,13 @@ class AppointmentRepository(BaseRepository[Appointment]):
         start_dt = datetime.combine(start_date, datetime.min.time())
         end_dt = datetime.combine(end_date, datetime.max.time())
         
+        income = func.sum(Service.price).label("income")
+        
         # Construir consulta
         query = db.query(
             Barber.name,
             func.count(Appointment.id).label("count"),
-            func.sum(Service.price).label("income")
+            income
         ).join(Appointment, Appointment.barber_id == Barber.id)\
          .join(Service, Appointment.service_id == Service.id)\
          .filter(
@@ -202,6 +221,9 @@ class AppointmentRepository(BaseRepository[Appointment]):
         else:
             query = query.filter(Appointment.status != "cancelled")
         
-        results = query.group_by(Barber.id).all()
+        query = query.group_by(Barber.id).order_by(income.desc(), Barber.id)
+        if limit is not None:
+            query = query.limit(limit)
+        results = query.all()
         
         return [{"name": r[0], "count": r[1], "income": r[2] or 0.0} for r in results]
@@ -2,12 +2,13 @@
 Appointment service for Barber Manager.
 Handles appointment CRUD, conflict detection, and Google Calendar sync.
 """
+from dataclasses import dataclass, field
 from datetime import datetime, date, timedelta
 from typing import List, Optional, Tuple
 
 from sqlalchemy.orm import Session
 
-from database import get_db
+from database import get_db, on_commit
 from models.base import Appointment, Service, Client
 from services.settings_service import SettingsService
 from repositories.appointment_repository import AppointmentRepository
@@ -17,6 +18,25 @@ appointment_repo = AppointmentRepository()
 google_calendar_service = GoogleCalendarService()
 
 
+@dataclass(slots=True)
+class SlotGrid:
+    """
+    Time slots for a day with their availability packed into a bitmask.
+    Bit i of `available` is set when times[i] can be booked.
+    """
+    times: List[Tuple[int, int]] = field(default_factory=list)
+    available: int = 0
+    
+    def is_available(self, index: int) -> bool:
+        """Check whether the slot at the given index can be booked."""
+        return bool((self.available >> index) & 1)
+    
+    @property
+    def available_count(self) -> int:
+        """Number of bookable slots."""
+        return bin(self.available).count("1")
+
+
 class AppointmentService:
     """
     Service layer for appointment management.
@@ -28,6 +48,14 @@ class AppointmentService:
     DEFAULT_END_HOUR = 20
     SLOT_INTERVAL_MINUTES = 15
     
+    # Bumped after every commit that writes appointments so cached reports can be invalidated
+    data_version: int = 0
+    
+    @classmethod
+    def bump_data_version(cls) -> None:
+        """Invalidate caches built from appointments (registered with on_commit)."""
+        cls.data_version += 1
+    
     @classmethod
     def get_business_hours(cls, db: Session) -> Tuple[int, int]:
         """
@@ -89,7 +117,7 @@ class AppointmentService:
         target_date: date,
         service_duration: int,
         barber_id: int
-    ) -> List[Tuple[int, int, bool]]:
+    ) -> SlotGrid:
         """
         Get all time slots with availability status for a given date and service.
         
@@ -103,7 +131,7 @@ class AppointmentService:
             service_duration: Duration of the selected service in minutes
             
         Returns:
-            List of tuples (hour, minute, is_available)
+            SlotGrid with every slot time and an availability bitmask
         """
         # Get existing appointments for the date and barber
         existing_appointments = cls.get_appointments_for_date(db, target_date, barber_id=barber_id)
@@ -113,10 +141,14 @@ class AppointmentService:
         
         # Get dynamic end hour for validation
         _, end_hour = cls.get_business_hours(db)
+        business_end = datetime.combine(
+            target_date,
+            datetime.min.time().replace(hour=end_hour, minute=0)
+        )
         
-        result = []
+        available = 0
         
-        for hour, minute in all_slots:
+        for index, (hour, minute) in enumerate(all_slots):
             # Calculate potential start and end times
             slot_start = datetime.combine(
                 target_date, 
@@ -125,27 +157,19 @@ class AppointmentService:
             slot_end = slot_start + timedelta(minutes=service_duration)
             
             # Check if this slot would exceed business hours
-            business_end = datetime.combine(
-                target_date,
-                datetime.min.time().replace(hour=end_hour, minute=0)
-            )
-            
             if slot_end > business_end:
-                result.append((hour, minute, False))
                 continue
             
             # Check for overlap with existing appointments
-            is_available = True
-            for appt in existing_appointments:
-                # Overlap occurs if:
-                # existing.start < potential.end AND existing.end > potential.start
-                if appt.start_time < slot_end and appt.end_time > slot_start:
-                    is_available = False
-                    break
-            
-            result.append((hour, minute, is_available))
-        
-        return result
+            # Overlap occurs if:
+            # existing.start < potential.end AND existing.end > potential.start
+            if not any(
+                appt.start_time < slot_end and appt.end_time > slot_start
+                for appt in existing_appointments
+            ):
+                available |= 1 << index
+        
+        return SlotGrid(times=list(all_slots), available=available)
     
     @classmethod
     def check_slot_availability(
@@ -369,6 +393,39 @@ class AppointmentService:
         
         return google_calendar_service.create_event(calendar_id, event_data)
 
+    @classmethod
+    def sync_new_appointment(cls, db: Session, appointment_id: int) -> bool:
+        """
+        Create the Google Calendar event for an already saved appointment.
+        
+        Lets callers commit the appointment first and sync it afterwards
+        (e.g. from a background thread) instead of inside create_appointment.
+        
+        Args:
+            db: Database session
+            appointment_id: ID of the appointment to sync
+            
+        Returns:
+            False if the event could not be created, True otherwise
+            (including when sync is disabled or the event already exists)
+        """
+        if not cls._is_sync_enabled(db):
+            return True
+        
+        appointment = cls.get_appointment_by_id(db, appointment_id)
+        if not appointment:
+            return False
+        if appointment.google_event_id:
+            return True
+        
+        google_event_id = cls.sync_to_google(db, appointment, appointment.client, appointment.service)
+        if not google_event_id:
+            return False
+        
+        appointment.google_event_id = google_event_id
+        db.flush()
+        return True
+    
     @classmethod
     def sync_appointment_update(cls, db: Session, appointment: Appointment) -> bool:
         """
@@ -501,3 +558,6 @@ class AppointmentService:
                 })
         
         return schedule
+
+
+on_commit(Appointment, AppointmentService.bump_data_version)
@@ -2,18 +2,36 @@
 Servicio de autenticación para Barber Manager.
 Maneja el hash de contraseñas, validación, rate limiting y sesión.
 """
+import time
+import hashlib
+import secrets
 import bcrypt
 from datetime import datetime, timedelta
-from typing import Optional, Tuple
-from sqlalchemy.orm import Session
+from typing import Dict, Optional, Tuple
+from sqlalchemy.orm import Session, joinedload
 from models.base import User, Barber
-from config import logger
+from config import logger, SecurityConfig
 
 
 # Configuración de rate limiting
 MAX_FAILED_ATTEMPTS = 5
 LOCKOUT_DURATION_MINUTES = 5
 
+# Límites de entrada validados antes de tocar la base de datos o bcrypt
+MAX_USERNAME_LENGTH = 50  # Coincide con users.username VARCHAR(50)
+BCRYPT_MAX_PASSWORD_BYTES = 72  # bcrypt no admite contraseñas más largas
+
+# Caché de autenticaciones recientes (evita repetir bcrypt en re-logins)
+AUTH_CACHE_TTL_SECONDS = 60
+AUTH_CACHE_MAX_ENTRIES = 256
+
+# (username, digest de contraseña) -> (expira_en, user_id, password_hash)
+# El hash guardado se compara con el actual: si el usuario se recreó o cambió
+# su contraseña por cualquier vía, la entrada deja de valer.
+_auth_cache: Dict[Tuple[str, bytes], Tuple[float, int, str]] = {}
+# Salt aleatorio por proceso para que los digests no sean reutilizables fuera de él
+_auth_cache_salt = secrets.token_bytes(16)
+
 
 class AuthService:
     """
@@ -21,17 +39,129 @@ class AuthService:
     Incluye protección contra ataques de fuerza bruta.
     """
 
+    # Costo de bcrypt resuelto una única vez por proceso
+    _bcrypt_rounds: Optional[int] = None
+
+    @classmethod
+    def get_bcrypt_rounds(cls) -> int:
+        """
+        Obtiene el costo de bcrypt a usar para nuevos hashes.
+        
+        Si BCRYPT_ROUNDS está configurado se usa, con BCRYPT_MIN_ROUNDS como
+        piso. Si no, se mide un hash con el costo mínimo y se elige el mayor
+        costo cuyo tiempo estimado no supere BCRYPT_TARGET_MS (cada ronda
+        duplica el tiempo).
+        
+        Retorna:
+            Costo de bcrypt (log2 de iteraciones)
+        """
+        if cls._bcrypt_rounds is not None:
+            return cls._bcrypt_rounds
+        
+        if SecurityConfig.BCRYPT_ROUNDS is not None:
+            cls._bcrypt_rounds = max(SecurityConfig.BCRYPT_ROUNDS, SecurityConfig.BCRYPT_MIN_ROUNDS)
+            return cls._bcrypt_rounds
+        
+        rounds = SecurityConfig.BCRYPT_MIN_ROUNDS
+        start = time.perf_counter()
+        bcrypt.hashpw(b"calibration", bcrypt.gensalt(rounds=rounds))
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        
+        while rounds < SecurityConfig.BCRYPT_MAX_ROUNDS and elapsed_ms * 2 <= SecurityConfig.BCRYPT_TARGET_MS:
+            elapsed_ms *= 2
+            rounds += 1
+        
+        logger.info(f"Costo de bcrypt calibrado: {rounds} (~{elapsed_ms:.0f} ms por hash)")
+        cls._bcrypt_rounds = rounds
+        return rounds
+
     @staticmethod
-    def hash_password(password: str) -> str:
+    def _get_hash_rounds(hashed_password: str) -> Optional[int]:
+        """Extrae el costo embebido en un hash bcrypt ($2b$<costo>$...)."""
+        try:
+            return int(hashed_password.split("$")[2])
+        except (IndexError, ValueError):
+            return None
+
+    @classmethod
+    def hash_password(cls, password: str) -> str:
         """Genera un hash de la contraseña para almacenamiento seguro."""
-        salt = bcrypt.gensalt()
+        salt = bcrypt.gensalt(rounds=cls.get_bcrypt_rounds())
         return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
 
     @staticmethod
     def verify_password(password: str, hashed_password: str) -> bool:
-        """Verifica una contraseña contra su hash."""
+        """
+        Verifica una contraseña contra su hash.
+
+        bcrypt.checkpw recalcula el hash con el salt almacenado y compara el
+        resultado en tiempo constante, por lo que no se filtra información
+        por tiempo de respuesta. No reemplazar por una comparación con ==.
+        """
         return bcrypt.checkpw(password.encode('utf-8'), hashed_password.encode('utf-8'))
 
+    @staticmethod
+    def is_valid_login_input(username: str, password: str) -> bool:
+        """
+        Descarta credenciales que nunca pueden ser válidas sin consultar la base de datos.
+        
+        Args:
+            username: Nombre de usuario
+            password: Contraseña
+            
+        Retorna:
+            True si vale la pena intentar la autenticación
+        """
+        if not username or not password:
+            return False
+        if len(username) > MAX_USERNAME_LENGTH or not username.isprintable():
+            return False
+        return len(password.encode('utf-8')) <= BCRYPT_MAX_PASSWORD_BYTES
+
+    @staticmethod
+    def _auth_cache_key(username: str, password: str) -> Tuple[str, bytes]:
+        """Construye la clave de caché sin almacenar la contraseña en claro."""
+        digest = hashlib.sha256(_auth_cache_salt + password.encode('utf-8')).digest()
+        return username, digest
+
+    @classmethod
+    def _remember_authentication(cls, username: str, password: str, user: User) -> None:
+        """Registra una autenticación exitosa en la caché con su TTL."""
+        now = time.monotonic()
+        if len(_auth_cache) >= AUTH_CACHE_MAX_ENTRIES:
+            for key in [k for k, entry in _auth_cache.items() if entry[0] <= now]:
+                del _auth_cache[key]
+            if len(_auth_cache) >= AUTH_CACHE_MAX_ENTRIES:
+                _auth_cache.clear()
+        _auth_cache[cls._auth_cache_key(username, password)] = (
+            now + AUTH_CACHE_TTL_SECONDS, user.id, user.password_hash
+        )
+
+    @classmethod
+    def _is_recently_authenticated(cls, username: str, password: str, user: User) -> bool:
+        """Verifica si la combinación usuario/contraseña se validó hace menos del TTL contra el mismo hash."""
+        cached = _auth_cache.get(cls._auth_cache_key(username, password))
+        return (
+            cached is not None
+            and cached[0] > time.monotonic()
+            and cached[1] == user.id
+            and cached[2] == user.password_hash
+        )
+
+    @staticmethod
+    def invalidate_auth_cache(username: Optional[str] = None) -> None:
+        """
+        Invalida la caché de autenticaciones.
+        
+        Args:
+            username: Usuario a invalidar (si es None, se vacía toda la caché)
+        """
+        if username is None:
+            _auth_cache.clear()
+            return
+        for key in [k for k in _auth_cache if k[0] == username]:
+            del _auth_cache[key]
+
     @classmethod
     def _is_locked(cls, user: User) -> bool:
         """
@@ -136,7 +266,16 @@ class AuthService:
             - Si éxito: (User, None)
             - Si falla: (None, mensaje)
         """
-        user = db.query(User).filter(User.username == username, User.is_active == True).first()
+        if not cls.is_valid_login_input(username, password):
+            return None, "Credenciales inválidas"
+        
+        # Cargar el barbero en la misma consulta para evitar un SELECT extra al usarlo
+        user = (
+            db.query(User)
+            .options(joinedload(User.barber))
+            .filter(User.username == username, User.is_active == True)
+            .first()
+        )
         
         if not user:
             logger.info(f"Intento de login con usuario inexistente: {username}")
@@ -148,10 +287,18 @@ class AuthService:
             logger.warning(f"Intento de login en cuenta bloqueada: {username}")
             return None, f"Cuenta bloqueada. Intente en {remaining} minutos"
         
-        # Verificar contraseña
-        if cls.verify_password(password, user.password_hash):
+        # Verificar contraseña (omitiendo bcrypt si se validó recientemente)
+        if (cls._is_recently_authenticated(username, password, user)
+                or cls.verify_password(password, user.password_hash)):
+            # Re-hashear solo hashes más débiles que el costo actual: nunca bajar el costo,
+            # ni alternar entre costos si la calibración varía entre reinicios
+            stored_rounds = cls._get_hash_rounds(user.password_hash)
+            if stored_rounds is None or stored_rounds < cls.get_bcrypt_rounds():
+                user.password_hash = cls.hash_password(password)
+            
             # Login exitoso - resetear intentos
             cls._reset_failed_attempts(db, user)
+            cls._remember_authentication(username, password, user)
             logger.info(f"Login exitoso: {username}")
             return user, None
         else:
@@ -213,6 +360,7 @@ class AuthService:
         user.password_hash = cls.hash_password(new_password)
         user.must_change_password = False
         db.flush()
+        cls.invalidate_auth_cache(user.username)
         
         logger.info(f"Contraseña cambiada para usuario {user.username}")
         return True, None
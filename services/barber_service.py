@@ -6,12 +6,21 @@ from typing import List, Optional, Tuple
 from datetime import datetime, date
 from sqlalchemy.orm import Session
 from sqlalchemy import func
+from database import on_commit
 from models.base import Barber, Appointment
 
 
 class BarberService:
     """Capa de servicio para gestión de barberos."""
     
+    # Versión de los datos de barberos: se incrementa tras cada commit que escribe barberos para invalidar cachés
+    data_version: int = 0
+    
+    @classmethod
+    def bump_data_version(cls) -> None:
+        """Invalida las cachés que dependen de los barberos (registrado con on_commit)."""
+        cls.data_version += 1
+    
     @staticmethod
     def get_all_barbers(db: Session, include_inactive: bool = False) -> List[Barber]:
         """
@@ -220,3 +229,5 @@ class BarberService:
             "pending": total_appointments - completed - cancelled
         }
 
+
+on_commit(Barber, BarberService.bump_data_version)
@@ -5,12 +5,17 @@ Maneja operaciones CRUD de clientes y funcionalidad de búsqueda.
 import re
 from typing import List, Optional, Tuple
 
+from sqlalchemy import Row, or_
 from sqlalchemy.orm import Session
 
 from models.base import Client
 from utils.validators import validate_email, validate_phone, validate_name
 
 
+# Máximo de resultados por búsqueda (la búsqueda se ejecuta mientras se escribe)
+CLIENT_SEARCH_LIMIT = 20
+
+
 class ClientService:
     """
     Capa de servicio para gestión de clientes.
@@ -48,7 +53,8 @@ class ClientService:
     def search_clients(
         cls, 
         db: Session, 
-        search_term: str
+        search_term: str,
+        limit: int = CLIENT_SEARCH_LIMIT
     ) -> List[Client]:
         """
         Busca clientes por nombre o número de teléfono.
@@ -56,23 +62,15 @@ class ClientService:
         Args:
             db: Sesión de base de datos
             search_term: Cadena de búsqueda
+            limit: Cantidad máxima de resultados
             
         Retorna:
             Lista de clientes que coinciden
         """
-        if not search_term:
-            return []
-        
-        # Sanitizar entrada para prevenir inyección SQL
-        from utils.validators import sanitize_string
-        search_term = sanitize_string(search_term)
-        if not search_term:
+        search_pattern = cls._build_search_pattern(search_term)
+        if not search_pattern:
             return []
         
-        # Escapar caracteres especiales de SQL LIKE
-        search_term = re.sub(r'[%_\\]', '', search_term)
-        search_pattern = f"%{search_term}%"
-        
         return (
             db.query(Client)
             .filter(
@@ -80,10 +78,57 @@ class ClientService:
                 (Client.phone.ilike(search_pattern))
             )
             .order_by(Client.name)
-            .limit(10)
+            .limit(limit)
+            .all()
+        )
+    
+    @classmethod
+    def search_clients_autocomplete(
+        cls,
+        db: Session,
+        search_term: str,
+        limit: int = CLIENT_SEARCH_LIMIT
+    ) -> List[Row]:
+        """
+        Busca clientes para autocompletado, consultando solo las columnas mostradas.
+        No construye objetos Client ni carga columnas como las notas.
+        
+        Args:
+            db: Sesión de base de datos
+            search_term: Cadena de búsqueda
+            limit: Cantidad máxima de resultados
+            
+        Retorna:
+            Lista de filas (id, name, email, phone)
+        """
+        search_pattern = cls._build_search_pattern(search_term)
+        if not search_pattern:
+            return []
+        
+        return (
+            db.query(Client.id, Client.name, Client.email, Client.phone)
+            .filter(or_(Client.name.ilike(search_pattern), Client.phone.ilike(search_pattern)))
+            .order_by(Client.name)
+            .limit(limit)
             .all()
         )
     
+    @staticmethod
+    def _build_search_pattern(search_term: str) -> Optional[str]:
+        """Sanitiza el término y arma el patrón LIKE; None si queda vacío."""
+        if not search_term:
+            return None
+        
+        # Sanitizar entrada para prevenir inyección SQL
+        from utils.validators import sanitize_string
+        search_term = sanitize_string(search_term)
+        if not search_term:
+            return None
+        
+        # Escapar caracteres especiales de SQL LIKE
+        search_term = re.sub(r'[%_\\]', '', search_term)
+        return f"%{search_term}%"
+    
     @classmethod
     def create_client(
         cls,
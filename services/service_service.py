@@ -6,6 +6,7 @@ from typing import List, Optional, Tuple
 
 from sqlalchemy.orm import Session
 
+from database import on_commit
 from models.base import Service
 
 
@@ -15,6 +16,14 @@ class ServiceService:
     Encapsula toda la lógica de negocio relacionada con servicios.
     """
     
+    # Versión del catálogo: se incrementa tras cada commit que escribe servicios para invalidar cachés
+    data_version: int = 0
+    
+    @classmethod
+    def bump_data_version(cls) -> None:
+        """Invalida las cachés que dependen de los servicios (registrado con on_commit)."""
+        cls.data_version += 1
+    
     @classmethod
     def get_all_services(cls, db: Session, active_only: bool = True) -> List[Service]:
         """
@@ -32,6 +41,26 @@ class ServiceService:
             query = query.filter(Service.is_active == True)
         return query.all()
     
+    @classmethod
+    def get_all_services_lite(cls, db: Session, active_only: bool = True) -> List[dict]:
+        """
+        Obtiene los servicios como diccionarios, consultando solo las columnas usadas.
+        Evita construir objetos ORM cuando solo se necesitan los datos.
+        
+        Args:
+            db: Sesión de base de datos
+            active_only: Si es True, solo retorna servicios activos
+            
+        Retorna:
+            Lista de diccionarios con id, name, duration, price e is_active
+        """
+        query = db.query(
+            Service.id, Service.name, Service.duration, Service.price, Service.is_active
+        ).order_by(Service.name)
+        if active_only:
+            query = query.filter(Service.is_active == True)
+        return [row._asdict() for row in query.all()]
+    
     @classmethod
     def get_service_by_id(cls, db: Session, service_id: int) -> Optional[Service]:
         """
@@ -174,3 +203,6 @@ class ServiceService:
         
         db.delete(service)
         return True, None
+
+
+on_commit(Service, ServiceService.bump_data_version)
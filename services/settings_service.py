@@ -2,7 +2,7 @@
 Servicio de configuración para Barber Manager.
 Maneja la persistencia de configuración de la aplicación.
 """
-from typing import Optional
+from typing import Dict, Iterable, Optional
 
 from sqlalchemy.orm import Session
 
@@ -42,6 +42,45 @@ class SettingsService:
             setting = Settings(key=key, value=value)
             db.add(setting)
     
+    @classmethod
+    def set_settings(cls, db: Session, values: Dict[str, str]) -> None:
+        """
+        Establece varias configuraciones a la vez.
+        Carga las existentes con una sola consulta en lugar de una por clave.
+        
+        Args:
+            db: Sesión de base de datos
+            values: Diccionario de clave -> valor
+        """
+        existing = {
+            setting.key: setting
+            for setting in db.query(Settings).filter(Settings.key.in_(values)).all()
+        }
+        for key, value in values.items():
+            setting = existing.get(key)
+            if setting:
+                setting.value = value
+            else:
+                db.add(Settings(key=key, value=value))
+    
+    @classmethod
+    def get_settings(cls, db: Session, keys: Iterable[str]) -> Dict[str, Optional[str]]:
+        """
+        Obtiene varias configuraciones con una sola consulta.
+        
+        Args:
+            db: Sesión de base de datos
+            keys: Claves a obtener
+            
+        Retorna:
+            Diccionario de clave -> valor (o el valor por defecto si no existe)
+        """
+        keys = tuple(keys)
+        found = dict(
+            db.query(Settings.key, Settings.value).filter(Settings.key.in_(keys)).all()
+        )
+        return {key: found.get(key, DEFAULT_SETTINGS.get(key)) for key in keys}
+    
     @classmethod
     def get_business_hours(cls, db: Session) -> tuple:
         """
@@ -53,9 +92,8 @@ class SettingsService:
         Retorna:
             Tupla de (hora_inicio, hora_fin) como enteros
         """
-        start = cls.get_setting(db, "business_hours_start")
-        end = cls.get_setting(db, "business_hours_end")
-        return int(start), int(end)
+        hours = cls.get_settings(db, ("business_hours_start", "business_hours_end"))
+        return int(hours["business_hours_start"]), int(hours["business_hours_end"])
     
     @classmethod
     def set_business_hours(cls, db: Session, start_hour: int, end_hour: int) -> None:
@@ -67,8 +105,10 @@ class SettingsService:
             start_hour: Hora de apertura (0-23)
             end_hour: Hora de cierre (0-23)
         """
-        cls.set_setting(db, "business_hours_start", str(start_hour))
-        cls.set_setting(db, "business_hours_end", str(end_hour))
+        cls.set_settings(db, {
+            "business_hours_start": str(start_hour),
+            "business_hours_end": str(end_hour),
+        })
     
     @classmethod
     def get_setting(cls, db: Session, key: str, default: str = None) -> Optional[str]:
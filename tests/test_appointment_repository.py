@@ -115,3 +115,41 @@ class TestAppointmentRepository:
         assert "pending" in stats
         assert "cancelled" in stats
         assert stats["confirmed"]["count"] >= 1
+    
+    def test_get_stats_by_status_empty_period(self, db_session, setup_data):
+        """Test que un periodo sin turnos retorna ceros en todos los estados."""
+        repo = AppointmentRepository()
+        
+        past = date(2020, 1, 1)
+        stats = repo.get_stats_by_status(db_session, past, past)
+        
+        for status in ("confirmed", "pending", "cancelled", "total"):
+            assert stats[status]["count"] == 0
+            assert stats[status]["income"] == 0.0
+    
+    def test_get_barber_performance_limit_orders_by_income(self, db_session, setup_data):
+        """Test que el límite retorna los barberos con más ingresos primero."""
+        repo = AppointmentRepository()
+        
+        top_barber = Barber(name="Top Barber", color="#00FF00")
+        db_session.add(top_barber)
+        db_session.flush()
+        
+        today = date.today()
+        for hour, barber in ((9, setup_data["barber"]), (10, top_barber), (11, top_barber)):
+            start = datetime.combine(today, datetime.min.time().replace(hour=hour))
+            db_session.add(Appointment(
+                client_id=setup_data["client"].id,
+                service_id=setup_data["service"].id,
+                barber_id=barber.id,
+                start_time=start,
+                end_time=start + timedelta(minutes=30),
+                status="confirmed"
+            ))
+        db_session.commit()
+        
+        all_barbers = repo.get_barber_performance(db_session, today, today, status="confirmed")
+        top = repo.get_barber_performance(db_session, today, today, status="confirmed", limit=1)
+        
+        assert [b["name"] for b in all_barbers] == ["Top Barber", "Test Barber"]
+        assert top == [{"name": "Top Barber", "count": 2, "income": 200.0}]
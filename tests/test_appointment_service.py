@@ -40,11 +40,27 @@ def test_get_available_slots_respects_business_end(db_session, sample_service, s
     # 11:30 + 30m = 12:00 (OK)
     
     # Slot 11:30 should be available, 11:45 should not
-    slot_11_30 = next(s for s in slots if s[0] == 11 and s[1] == 30)
-    slot_11_45 = next(s for s in slots if s[0] == 11 and s[1] == 45)
+    assert slots.is_available(slots.times.index((11, 30))) is True
+    assert slots.is_available(slots.times.index((11, 45))) is False
+    assert slots.available_count == 7
+
+def test_get_available_slots_marks_conflicts(db_session, sample_client, sample_service, sample_barber):
+    """Test that slots overlapping an existing appointment are not available."""
+    SettingsService.set_business_hours(db_session, 10, 12)
+    db_session.commit()
     
-    assert slot_11_30[2] is True
-    assert slot_11_45[2] is False
+    target_date = date.today()
+    start_time = datetime.combine(target_date, datetime.min.time().replace(hour=10, minute=30))
+    _, error = AppointmentService.create_appointment(
+        db_session, sample_client.id, sample_service.id, sample_barber.id, start_time
+    )
+    assert error is None
+    
+    slots = AppointmentService.get_available_slots(db_session, target_date, 30, barber_id=sample_barber.id)
+    
+    assert slots.is_available(slots.times.index((10, 0))) is True
+    assert slots.is_available(slots.times.index((10, 15))) is False
+    assert slots.is_available(slots.times.index((10, 30))) is False
 
 def test_get_daily_schedule_custom_hours(db_session, sample_barber):
     """Test that daily schedule reflects custom hours."""
@@ -76,3 +92,56 @@ def test_multi_barber_collision_avoidance(db_session, sample_client, sample_serv
     app2, err2 = AppointmentService.create_appointment(db_session, sample_client.id, sample_service.id, b2.id, start_time)
     assert err2 is None
     assert app1.id != app2.id
+
+def test_sync_new_appointment_sets_event_id(db_session, sample_client, sample_service, sample_barber, monkeypatch):
+    """Test deferred Google sync stores the event id, and reports failures."""
+    start_time = datetime.combine(date.today(), datetime.min.time().replace(hour=13))
+    appointment, error = AppointmentService.create_appointment(
+        db_session, sample_client.id, sample_service.id, sample_barber.id, start_time, sync_to_google=False
+    )
+    assert error is None
+    
+    # Sync disabled: nothing to do
+    assert AppointmentService.sync_new_appointment(db_session, appointment.id) is True
+    
+    SettingsService.set_setting(db_session, "google_calendar_enabled", "true")
+    db_session.commit()
+    monkeypatch.setattr(AppointmentService, "sync_to_google", classmethod(lambda cls, *args: None))
+    assert AppointmentService.sync_new_appointment(db_session, appointment.id) is False
+    assert appointment.google_event_id is None
+    
+    monkeypatch.setattr(AppointmentService, "sync_to_google", classmethod(lambda cls, *args: "evt-1"))
+    assert AppointmentService.sync_new_appointment(db_session, appointment.id) is True
+    assert appointment.google_event_id == "evt-1"
+
+def test_appointment_writes_bump_data_version(db_session, sample_client, sample_service, sample_barber):
+    """Test that committed create, status change and delete invalidate cached reports."""
+    version = AppointmentService.data_version
+    start_time = datetime.combine(date.today(), datetime.min.time().replace(hour=14))
+    
+    appointment, _ = AppointmentService.create_appointment(
+        db_session, sample_client.id, sample_service.id, sample_barber.id, start_time
+    )
+    assert AppointmentService.data_version == version
+    db_session.commit()
+    assert AppointmentService.data_version == version + 1
+    
+    AppointmentService.update_appointment_status(db_session, appointment.id, "confirmed")
+    db_session.commit()
+    assert AppointmentService.data_version == version + 2
+    
+    AppointmentService.delete_appointment(db_session, appointment.id)
+    db_session.commit()
+    assert AppointmentService.data_version == version + 3
+
+def test_rolled_back_write_keeps_data_version(db_session, sample_client, sample_service, sample_barber):
+    """Test that a write that is never committed does not invalidate caches."""
+    version = AppointmentService.data_version
+    start_time = datetime.combine(date.today(), datetime.min.time().replace(hour=15))
+    
+    AppointmentService.create_appointment(
+        db_session, sample_client.id, sample_service.id, sample_barber.id, start_time
+    )
+    db_session.rollback()
+    
+    assert AppointmentService.data_version == version
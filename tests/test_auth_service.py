@@ -5,6 +5,14 @@ import pytest
 from services.auth_service import AuthService
 from models.base import Barber, User
 
+
+@pytest.fixture(autouse=True)
+def clear_auth_cache():
+    """Ensure cached authentications do not leak between tests."""
+    AuthService.invalidate_auth_cache()
+    yield
+    AuthService.invalidate_auth_cache()
+
 def test_create_user(db_session, sample_barber):
     """Test user creation with hashed password."""
     user, error = AuthService.create_user(
@@ -36,3 +44,82 @@ def test_authenticate_fail_nonexistent_user(db_session):
     user, error = AuthService.authenticate(db_session, "ghost", "anypass")
     assert user is None
     assert error == "Credenciales inválidas"
+
+def test_hash_password_uses_configured_rounds(monkeypatch):
+    """Test that new hashes embed the resolved bcrypt cost."""
+    monkeypatch.setattr(AuthService, "_bcrypt_rounds", 4)
+    hashed = AuthService.hash_password("securepass")
+    assert hashed.startswith("$2b$04$")
+
+def test_authenticate_rehashes_legacy_cost(db_session, sample_user, monkeypatch):
+    """Test that a successful login upgrades hashes with a lower cost."""
+    monkeypatch.setattr(AuthService, "_bcrypt_rounds", 4)
+    sample_user.password_hash = AuthService.hash_password("testpassword")
+    db_session.commit()
+    monkeypatch.setattr(AuthService, "_bcrypt_rounds", 5)
+    user, error = AuthService.authenticate(db_session, "testuser", "testpassword")
+    assert error is None
+    assert user.password_hash.startswith("$2b$05$")
+    assert AuthService.verify_password("testpassword", user.password_hash)
+
+def test_authenticate_keeps_higher_cost(db_session, sample_user, monkeypatch):
+    """Test that a successful login never downgrades a stronger hash."""
+    monkeypatch.setattr(AuthService, "_bcrypt_rounds", 5)
+    sample_user.password_hash = AuthService.hash_password("testpassword")
+    db_session.commit()
+    monkeypatch.setattr(AuthService, "_bcrypt_rounds", 4)
+    user, error = AuthService.authenticate(db_session, "testuser", "testpassword")
+    assert error is None
+    assert user.password_hash.startswith("$2b$05$")
+
+def test_configured_rounds_respect_minimum(monkeypatch):
+    """Test that BCRYPT_ROUNDS below the minimum is raised to it."""
+    from config import SecurityConfig
+    monkeypatch.setattr(AuthService, "_bcrypt_rounds", None)
+    monkeypatch.setattr(SecurityConfig, "BCRYPT_ROUNDS", 5)
+    assert AuthService.get_bcrypt_rounds() == SecurityConfig.BCRYPT_MIN_ROUNDS
+
+def test_authenticate_uses_recent_cache(db_session, sample_user, monkeypatch):
+    """Test that a repeated login within the TTL skips bcrypt verification."""
+    AuthService.authenticate(db_session, "testuser", "testpassword")
+
+    def fail_verify(*args):
+        raise AssertionError("bcrypt should not run on a cached login")
+
+    monkeypatch.setattr(AuthService, "verify_password", fail_verify)
+    user, error = AuthService.authenticate(db_session, "testuser", "testpassword")
+    assert error is None
+    assert user.id == sample_user.id
+
+def test_change_password_invalidates_cache(db_session, sample_user):
+    """Test that the old password is rejected after a password change."""
+    AuthService.authenticate(db_session, "testuser", "testpassword")
+    AuthService.change_password(db_session, sample_user.id, "newpassword")
+    user, error = AuthService.authenticate(db_session, "testuser", "testpassword")
+    assert user is None
+    assert "Credenciales inválidas" in error
+
+def test_cache_ignores_password_changed_elsewhere(db_session, sample_user):
+    """Test that a cached login is rejected once the stored hash changes by other means."""
+    AuthService.authenticate(db_session, "testuser", "testpassword")
+    sample_user.password_hash = AuthService.hash_password("otherpassword")
+    db_session.flush()
+    user, error = AuthService.authenticate(db_session, "testuser", "testpassword")
+    assert user is None
+    assert "Credenciales inválidas" in error
+
+def test_authenticate_rejects_oversized_input(db_session, sample_user):
+    """Test that impossible credentials are rejected before hitting bcrypt."""
+    user, error = AuthService.authenticate(db_session, "testuser", "x" * 73)
+    assert user is None
+    assert error == "Credenciales inválidas"
+    assert not AuthService.is_valid_login_input("u" * 51, "testpassword")
+
+def test_authenticate_eager_loads_barber(db_session, sample_user, sample_barber):
+    """Test that the barber relationship is loaded with the user."""
+    from sqlalchemy import inspect
+    barber_name = sample_barber.name
+    db_session.expunge_all()
+    user, error = AuthService.authenticate(db_session, "testuser", "testpassword")
+    assert "barber" not in inspect(user).unloaded
+    assert user.barber.name == barber_name
@@ -92,6 +92,29 @@ class TestClientServiceRead:
         assert len(results) >= 1
         assert any(c.id == sample_client.id for c in results)
     
+    def test_search_clients_respects_limit(self, db_session: Session):
+        """Test search never returns more rows than the limit."""
+        for i in range(5):
+            db_session.add(Client(name=f"Limite {i}", email=f"limite{i}@test.com"))
+        db_session.flush()
+        
+        results = ClientService.search_clients(db_session, "Limite", limit=3)
+        
+        assert len(results) == 3
+    
+    def test_search_clients_autocomplete_returns_rows(self, db_session: Session, sample_client: Client):
+        """Test autocomplete search returns only the displayed columns."""
+        results = ClientService.search_clients_autocomplete(db_session, sample_client.name[:4])
+        
+        assert len(results) >= 1
+        row = next(r for r in results if r.id == sample_client.id)
+        assert row._asdict() == {
+            "id": sample_client.id,
+            "name": sample_client.name,
+            "email": sample_client.email,
+            "phone": sample_client.phone
+        }
+    
     def test_search_clients_empty_term(self, db_session: Session):
         """Test search with empty term returns empty list."""
         results = ClientService.search_clients(db_session, "")
@@ -0,0 +1,79 @@
+"""
+Unit tests for the persistent report cache.
+"""
+import pytest
+from sqlalchemy.orm import Session
+
+from models.base import Service
+from utils import report_cache as report_cache_module
+from utils.report_cache import ReportCache
+
+
+@pytest.fixture
+def cache(tmp_path) -> ReportCache:
+    """Cache backed by a temporary file."""
+    return ReportCache(str(tmp_path / "cache" / "reports.sqlite"), ttl_seconds=60)
+
+
+class TestReportCache:
+    """Tests for ReportCache"""
+    
+    def test_set_and_get_round_trip(self, cache: ReportCache):
+        """Test stored values come back deserialized."""
+        report = {"status_stats": {"total": {"count": 2, "income": 30.0}}, "barber_stats": []}
+        cache.set("2026-01-01:2026-01-31", report)
+        
+        assert cache.get("2026-01-01:2026-01-31") == report
+        assert cache.get("2026-02-01:2026-02-28") is None
+    
+    def test_expired_entry_is_a_miss(self, tmp_path):
+        """Test entries past their TTL are not returned."""
+        cache = ReportCache(str(tmp_path / "reports.sqlite"), ttl_seconds=-1)
+        cache.set("key", {"a": 1})
+        
+        assert cache.get("key") is None
+    
+    def test_empty_path_disables_cache(self):
+        """Test an empty path makes the cache a no-op."""
+        cache = ReportCache("", ttl_seconds=60)
+        cache.set("key", {"a": 1})
+        
+        assert cache.get("key") is None
+    
+    def test_clear_removes_entries(self, cache: ReportCache):
+        """Test clear drops every entry."""
+        cache.set("key", {"a": 1})
+        cache.clear()
+        
+        assert cache.get("key") is None
+    
+    def test_set_skips_value_computed_before_clear(self, cache: ReportCache):
+        """Test a value computed before a clear() is not stored after it."""
+        generation = cache.generation
+        cache.clear()
+        cache.set("key", {"a": 1}, generation)
+        
+        assert cache.get("key") is None
+    
+    def test_committed_write_invalidates_cache(self, db_session: Session, cache: ReportCache, monkeypatch):
+        """Test committing a model used by reports empties the shared cache; flushing does not."""
+        monkeypatch.setattr(report_cache_module, "report_cache", cache)
+        cache.set("key", {"a": 1})
+        
+        db_session.add(Service(name="Nuevo", duration=30, price=10.0))
+        db_session.flush()
+        assert cache.get("key") == {"a": 1}
+        
+        db_session.commit()
+        assert cache.get("key") is None
+    
+    def test_rolled_back_write_keeps_cache(self, db_session: Session, cache: ReportCache, monkeypatch):
+        """Test a rolled back write leaves the cache intact."""
+        monkeypatch.setattr(report_cache_module, "report_cache", cache)
+        cache.set("key", {"a": 1})
+        
+        db_session.add(Service(name="Nuevo", duration=30, price=10.0))
+        db_session.flush()
+        db_session.rollback()
+        
+        assert cache.get("key") == {"a": 1}
@@ -88,6 +88,14 @@ class TestServiceServiceRead:
         
         assert len(services) == 4  # Includes inactive
     
+    def test_get_all_services_lite(self, db_session: Session, sample_services: list):
+        """Test lite listing returns plain dicts of active services."""
+        services = ServiceService.get_all_services_lite(db_session)
+        
+        assert len(services) == 3
+        assert set(services[0]) == {"id", "name", "duration", "price", "is_active"}
+        assert [s["name"] for s in services] == ["Barba", "Combo", "Corte"]
+    
     def test_get_service_by_id(self, db_session: Session, sample_service: Service):
         """Test getting a service by ID."""
         service = ServiceService.get_service_by_id(db_session, sample_service.id)
@@ -175,3 +183,33 @@ class TestServiceServiceDelete:
         
         assert success is False
         assert error == "Servicio no encontrado"
+
+
+class TestServiceServiceDataVersion:
+    """Tests for ServiceService.data_version cache invalidation"""
+    
+    def test_writes_bump_data_version(self, db_session: Session):
+        """Test that create, update and delete bump the data version."""
+        version = ServiceService.data_version
+        
+        service, _ = ServiceService.create_service(db_session, name="Versioned", duration=30)
+        assert ServiceService.data_version == version
+        db_session.commit()
+        assert ServiceService.data_version == version + 1
+        
+        ServiceService.update_service(db_session, service.id, price=10.0)
+        db_session.commit()
+        assert ServiceService.data_version == version + 2
+        
+        ServiceService.delete_service(db_session, service.id)
+        db_session.commit()
+        assert ServiceService.data_version == version + 3
+    
+    def test_failed_write_keeps_data_version(self, db_session: Session):
+        """Test that rejected writes do not invalidate caches."""
+        version = ServiceService.data_version
+        
+        ServiceService.create_service(db_session, name="", duration=30)
+        db_session.commit()
+        
+        assert ServiceService.data_version == version
@@ -37,3 +37,23 @@ def test_set_get_business_hours(db_session):
     start, end = SettingsService.get_business_hours(db_session)
     assert start == 8
     assert end == 18
+
+def test_get_settings_mixes_stored_and_defaults(db_session):
+    """Test getting several settings at once falls back to defaults for missing keys."""
+    SettingsService.set_setting(db_session, "business_hours_start", "9")
+    db_session.commit()
+    
+    values = SettingsService.get_settings(db_session, ("business_hours_start", "business_hours_end", "missing"))
+    assert values == {"business_hours_start": "9", "business_hours_end": "20", "missing": None}
+
+def test_set_settings_inserts_and_updates(db_session):
+    """Test setting several values at once updates existing keys and creates new ones."""
+    SettingsService.set_setting(db_session, "theme", "light")
+    db_session.commit()
+    
+    SettingsService.set_settings(db_session, {"theme": "dark", "language": "es"})
+    db_session.commit()
+    
+    assert SettingsService.get_setting(db_session, "theme") == "dark"
+    assert SettingsService.get_setting(db_session, "language") == "es"
+    assert db_session.query(Settings).filter(Settings.key == "theme").count() == 1
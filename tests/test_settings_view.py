@@ -0,0 +1,50 @@
+"""
+Tests para la vista de configuración.
+Requieren Flet; se omiten si no está instalado.
+"""
+import pytest
+from types import SimpleNamespace
+
+ft = pytest.importorskip("flet")
+
+from views import settings_view
+
+
+@pytest.fixture
+def page(monkeypatch):
+    """Página mínima: la vista solo usa overlay, update y run_thread."""
+    monkeypatch.setattr(settings_view, "_get_business_hours", lambda: (9, 20))
+    return SimpleNamespace(overlay=[], update=lambda: None, run_thread=lambda fn: fn())
+
+
+class TestSettingsView:
+    """Tests para create_settings_view."""
+    
+    def test_builds_view(self, page):
+        """Test que la vista se construye y agrega sus diálogos al overlay."""
+        view = settings_view.create_settings_view(page)
+        
+        assert isinstance(view, ft.Column)
+        assert len([c for c in page.overlay if isinstance(c, ft.AlertDialog)]) == 2
+    
+    def test_reuses_view_per_page(self, page):
+        """Test que una segunda visita reutiliza la vista sin duplicar diálogos."""
+        view = settings_view.create_settings_view(page)
+        
+        assert settings_view.create_settings_view(page) is view
+        assert len(page.overlay) == 2
+    
+    def test_close_buttons_close_their_dialog(self, page):
+        """Test que el primer botón de cada diálogo lo cierra."""
+        settings_view.create_settings_view(page)
+        
+        for dialog in page.overlay:
+            dialog.open = True
+            dialog.actions[0].on_click(None)
+            assert dialog.open is False
+    
+    def test_state_is_stored_per_page(self, page):
+        """Test que cada página construye su propia vista."""
+        other_page = SimpleNamespace(overlay=[], update=lambda: None, run_thread=lambda fn: fn())
+        
+        assert settings_view.create_settings_view(page) is not settings_view.create_settings_view(other_page)
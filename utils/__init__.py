@@ -9,6 +9,7 @@ from utils.validators import (
     validate_time_range,
     sanitize_string
 )
+from utils.session import SessionData, get_session
 
 __all__ = [
     "validate_email",
@@ -18,5 +19,7 @@ __all__ = [
     "validate_price",
     "validate_date",
     "validate_time_range",
-    "sanitize_string"
+    "sanitize_string",
+    "SessionData",
+    "get_session"
 ]
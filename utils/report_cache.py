@@ -0,0 +1,120 @@
+"""
+Caché persistente de reportes para Barber Manager.
+Guarda en un archivo SQLite las estadísticas de periodos ya cerrados, de modo
+que sobreviven a reinicios de la aplicación. Cada commit que escribe turnos,
+servicios o barberos vacía la caché (el precio del servicio y el nombre del
+barbero también forman parte de los reportes).
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from typing import Any, Optional
+
+from config import CacheConfig, logger
+from database import on_commit
+from models.base import Appointment, Barber, Service
+
+
+class ReportCache:
+    """
+    Almacén clave-valor en disco con expiración.
+    Los valores se serializan como JSON; los errores de disco se registran y
+    se tratan como ausencia en caché, nunca interrumpen un reporte.
+    """
+
+    def __init__(self, path: str, ttl_seconds: int):
+        """
+        Args:
+            path: Ruta del archivo SQLite (cadena vacía deshabilita la caché)
+            ttl_seconds: Tiempo de vida de cada entrada en segundos
+        """
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        # Se incrementa en cada clear(): un valor calculado antes no debe guardarse después
+        self.generation = 0
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=5)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries "
+            "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        return conn
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Obtiene un valor vigente de la caché.
+
+        Args:
+            key: Clave de la entrada
+
+        Retorna:
+            Valor deserializado, o None si no existe, expiró o hubo un error
+        """
+        if not self.path or not os.path.exists(self.path):
+            return None
+        try:
+            with closing(self._connect()) as conn:
+                row = conn.execute(
+                    "SELECT value FROM entries WHERE key = ? AND expires_at > ?",
+                    (key, time.time())
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"No se pudo leer la caché de reportes: {e}")
+            return None
+        return json.loads(row[0]) if row else None
+
+    def set(self, key: str, value: Any, generation: Optional[int] = None) -> None:
+        """
+        Guarda un valor serializable a JSON.
+
+        Args:
+            key: Clave de la entrada
+            value: Valor a guardar
+            generation: Valor de self.generation leído antes de calcular value;
+                si hubo un clear() desde entonces, value no se guarda
+        """
+        if not self.path:
+            return
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            try:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                with closing(self._connect()) as conn, conn:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO entries (key, value, expires_at) VALUES (?, ?, ?)",
+                        (key, json.dumps(value), time.time() + self.ttl_seconds)
+                    )
+            except (sqlite3.Error, OSError) as e:
+                logger.warning(f"No se pudo escribir la caché de reportes: {e}")
+
+    def clear(self) -> None:
+        """Elimina todas las entradas."""
+        with self._lock:
+            self.generation += 1
+            if not self.path or not os.path.exists(self.path):
+                return
+            try:
+                with closing(self._connect()) as conn, conn:
+                    conn.execute("DELETE FROM entries")
+            except sqlite3.Error as e:
+                logger.warning(f"No se pudo vaciar la caché de reportes: {e}")
+
+
+report_cache = ReportCache(CacheConfig.REPORTS_CACHE_PATH, CacheConfig.REPORTS_CACHE_TTL_SECONDS)
+
+
+def _invalidate_reports() -> None:
+    """Vacía la caché persistente tras un commit que afecta los reportes."""
+    report_cache.clear()
+
+
+for _model in (Appointment, Service, Barber):
+    on_commit(_model, _invalidate_reports)
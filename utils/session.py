@@ -0,0 +1,30 @@
+"""
+Estado de sesión del usuario autenticado para Barber Manager.
+Se almacena en page.data (compatible con Flet 0.80.x).
+"""
+from dataclasses import dataclass
+from typing import Any, Optional
+
+
+@dataclass(slots=True)
+class SessionData:
+    """Datos de sesión del usuario autenticado."""
+    user_id: int
+    username: str
+    role: str
+    barber_id: Optional[int]
+    is_logged_in: bool = False
+
+
+def get_session(page: Any) -> Optional[SessionData]:
+    """
+    Obtiene la sesión activa de la página.
+    
+    Args:
+        page: Página de Flet
+        
+    Retorna:
+        SessionData si hay una sesión iniciada, None en caso contrario
+    """
+    session = getattr(page, "data", None)
+    return session if isinstance(session, SessionData) else None
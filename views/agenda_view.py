@@ -11,6 +11,7 @@ from models.base import Barber
 from services.appointment_service import AppointmentService
 from services.notification_service import NotificationService
 from services.barber_service import BarberService
+from utils.session import get_session
 from utils.theme import AppTheme
 
 
@@ -30,10 +31,9 @@ def create_agenda_view(page: ft.Page) -> ft.Control:
     selected_date = date.today()
     current_week_start = _get_week_start(date.today())
     
-    # Get barber_id from page.data for Flet 0.80.x
-    selected_barber_id: Optional[int] = None
-    if hasattr(page, 'data') and page.data is not None:
-        selected_barber_id = page.data.get("barber_id")
+    # Get barber_id from the session stored in page.data for Flet 0.80.x
+    session = get_session(page)
+    selected_barber_id: Optional[int] = session.barber_id if session else None
     
     barbers: List[dict] = []
     
@@ -3,96 +3,154 @@ Login view for Barber Manager.
 Handles user authentication and session initiation.
 """
 import flet as ft
+from config import logger
 from database import get_db
 from services.auth_service import AuthService
 from utils.theme import AppTheme
 
 
+# Estilo inmutable compartido entre construcciones de la vista.
+# Los controles (Text, Icon, Container) no se comparten: Flet exige un único padre por control.
+_LOGIN_BUTTON_STYLE = ft.ButtonStyle(
+    bgcolor=AppTheme.PRIMARY,
+    color=AppTheme.BTN_TEXT,
+    shape=ft.RoundedRectangleBorder(radius=8)
+)
+
+
+def _build_login_header() -> list:
+    """Construye los controles estáticos del encabezado del login."""
+    return [
+        ft.Icon(ft.Icons.CONTENT_CUT, size=80, color=AppTheme.PRIMARY),
+        ft.Text("Barber Manager Pro", size=32, weight=ft.FontWeight.BOLD, color=AppTheme.TEXT_PRIMARY),
+        ft.Text("Identifícate para continuar", color=AppTheme.TEXT_SECONDARY),
+        ft.Container(height=20),
+    ]
+
+
 def create_login_view(page: ft.Page, on_login_success) -> ft.Control:
     """
     Create the login screen.
     """
+    # Resolver colores e iconos una sola vez por construcción de la vista
+    border_default = AppTheme.BORDER_DEFAULT
+    border_focus = AppTheme.BORDER_FOCUS
+    text_primary = AppTheme.TEXT_PRIMARY
+    text_error = AppTheme.TEXT_ERROR
+    btn_text = AppTheme.BTN_TEXT
+    background = AppTheme.BACKGROUND
+    icon_person = ft.Icons.PERSON
+    icon_lock = ft.Icons.LOCK
+
     username_field = ft.TextField(
         label="Usuario",
-        prefix_icon=ft.Icons.PERSON,
-        border_color=AppTheme.BORDER_DEFAULT,
-        focused_border_color=AppTheme.BORDER_FOCUS,
+        prefix_icon=icon_person,
+        border_color=border_default,
+        focused_border_color=border_focus,
         on_submit=lambda _: password_field.focus(),
-        color=AppTheme.TEXT_PRIMARY
+        color=text_primary
     )
     
     password_field = ft.TextField(
         label="Contraseña",
-        prefix_icon=ft.Icons.LOCK,
+        prefix_icon=icon_lock,
         password=True,
         can_reveal_password=True,
-        border_color=AppTheme.BORDER_DEFAULT,
-        focused_border_color=AppTheme.BORDER_FOCUS,
+        border_color=border_default,
+        focused_border_color=border_focus,
         on_submit=lambda _: do_login(None),
-        color=AppTheme.TEXT_PRIMARY
+        color=text_primary
     )
     
-    error_text = ft.Text(color=AppTheme.TEXT_ERROR, size=12, visible=False)
+    error_text = ft.Text(color=text_error, size=12, visible=False)
+    progress_ring = ft.ProgressRing(width=24, height=24, visible=False)
+    
+    # Evita verificaciones bcrypt duplicadas por doble click o Enter + click
+    login_in_progress = False
+    
+    def show_error(message: str):
+        """Muestra un error de login y restablece el formulario con un único page.update()."""
+        error_text.value = message
+        error_text.visible = True
+        progress_ring.visible = False
+        login_button.disabled = False
+        page.update()
     
     def do_login(e):
+        nonlocal login_in_progress
+        if login_in_progress:
+            return
+        
         username = username_field.value.strip()
         password = password_field.value.strip()
         
         if not username or not password:
-            error_text.value = "Por favor ingrese usuario y contraseña"
-            error_text.visible = True
-            page.update()
+            show_error("Por favor ingrese usuario y contraseña")
+            return
+        
+        # Rechazar entradas imposibles sin abrir sesión ni ejecutar bcrypt
+        if not AuthService.is_valid_login_input(username, password):
+            show_error("Credenciales inválidas")
             return
+        
+        login_in_progress = True
+        login_button.disabled = True
+        error_text.visible = False
+        progress_ring.visible = True
+        page.update()
+        
+        # bcrypt es costoso: verificar fuera del hilo de eventos de la UI
+        page.run_thread(authenticate_in_background, username, password)
+    
+    def authenticate_in_background(username: str, password: str):
+        """Ejecuta la autenticación en un hilo de trabajo y actualiza la UI al terminar."""
+        nonlocal login_in_progress
+        user_data = None
+        try:
+            with get_db() as db:
+                user, error_msg = AuthService.authenticate(db, username, password)
+                if user:
+                    # Extraer datos del usuario DENTRO de la sesión para evitar DetachedInstanceError
+                    user_data = {
+                        "id": user.id,
+                        "username": user.username,
+                        "role": user.role,
+                        "barber_id": user.barber_id,
+                        "barber_name": user.barber.name if user.barber else None,
+                        "must_change_password": user.must_change_password
+                    }
             
-        with get_db() as db:
-            user, error_msg = AuthService.authenticate(db, username, password)
-            if user:
-                # Extraer datos del usuario DENTRO de la sesión para evitar DetachedInstanceError
-                user_data = {
-                    "id": user.id,
-                    "username": user.username,
-                    "role": user.role,
-                    "barber_id": user.barber_id,
-                    "must_change_password": getattr(user, 'must_change_password', False)
-                }
-                
-                # Guardar datos de sesión usando page.data para Flet 0.80.x
-                if not hasattr(page, 'data') or page.data is None:
-                    page.data = {}
-                page.data["user_id"] = user_data["id"]
-                page.data["username"] = user_data["username"]
-                page.data["role"] = user_data["role"]
-                page.data["barber_id"] = user_data["barber_id"]
-                
-                # Pasar diccionario en lugar de objeto ORM
+            if user_data:
+                # Pasar diccionario en lugar de objeto ORM; on_login_success crea la sesión.
+                # Sin page.update() aquí: on_login_success renderiza la siguiente vista.
                 on_login_success(user_data)
             else:
-                error_text.value = error_msg or "Credenciales inválidas"
-                error_text.visible = True
-                page.update()
+                show_error(error_msg or "Credenciales inválidas")
+        except Exception:
+            # Fallo de base de datos u otro error inesperado: informar y liberar el formulario
+            logger.exception("Error durante la autenticación")
+            show_error("Error de conexión. Intente nuevamente.")
+        finally:
+            login_in_progress = False
+            progress_ring.visible = False
+            login_button.disabled = False
 
     login_button = ft.ElevatedButton(
-        content=ft.Text("Iniciar Sesión", size=16, color=AppTheme.BTN_TEXT),
+        content=ft.Text("Iniciar Sesión", size=16, color=btn_text),
         width=300,
         height=50,
-        style=ft.ButtonStyle(
-            bgcolor=AppTheme.PRIMARY,
-            color=AppTheme.BTN_TEXT,
-            shape=ft.RoundedRectangleBorder(radius=8)
-        ),
+        style=_LOGIN_BUTTON_STYLE,
         on_click=do_login
     )
 
     return ft.Container(
         content=ft.Column(
             controls=[
-                ft.Icon(ft.Icons.CONTENT_CUT, size=80, color=AppTheme.PRIMARY),
-                ft.Text("Barber Manager Pro", size=32, weight=ft.FontWeight.BOLD, color=AppTheme.TEXT_PRIMARY),
-                ft.Text("Identifícate para continuar", color=AppTheme.TEXT_SECONDARY),
-                ft.Container(height=20),
+                *_build_login_header(),
                 username_field,
                 password_field,
                 error_text,
+                progress_ring,
                 ft.Container(height=10),
                 login_button
             ],
@@ -102,5 +160,5 @@ def create_login_view(page: ft.Page, on_login_success) -> ft.Control:
         alignment=ft.Alignment(0, 0),
         expand=True,
         padding=40,
-        bgcolor=AppTheme.BACKGROUND
+        bgcolor=background
     )
@@ -3,18 +3,114 @@ New Appointment view for Barber Manager.
 Form with smart time slot selection and conflict detection.
 """
 import flet as ft
+import threading
+import time
 from datetime import datetime, date, timedelta
-from typing import Optional, List
+from functools import lru_cache
+from typing import Dict, Optional, List, Tuple
 from urllib.parse import parse_qs
 
-from database import get_db
-from services.appointment_service import AppointmentService
+from config import logger
+from database import get_db, get_read_db
+from services.appointment_service import AppointmentService, SlotGrid
+from services.barber_service import BarberService
 from services.client_service import ClientService
 from services.service_service import ServiceService
 from models.base import Client, Service, Barber
 from utils.theme import AppTheme
 
 
+# Wait this long after the last keystroke before querying clients
+CLIENT_SEARCH_DEBOUNCE_SECONDS = 0.2
+
+# Slot availability reused while toggling services/barbers in one form
+SLOT_CACHE_TTL_SECONDS = 60
+
+# Barbers and services change rarely: keep them in memory for a few minutes
+CATALOG_CACHE_TTL_SECONDS = 300
+
+
+@lru_cache(maxsize=1)
+def _load_catalog(ts_bucket: int, barbers_version: int, services_version: int) -> Tuple[tuple, tuple]:
+    """
+    Load active barbers and services as plain dicts in a single session.
+    Cached per TTL bucket; the data versions invalidate it after any write.
+    """
+    with get_read_db() as db:
+        # Column projections: plain rows, no ORM objects to build and discard
+        barbers = tuple(
+            {"id": bid, "name": name, "color": color}
+            for bid, name, color in (
+                db.query(Barber.id, Barber.name, Barber.color)
+                .filter(Barber.is_active == True)
+                .all()
+            )
+        )
+        services = tuple(ServiceService.get_all_services_lite(db))
+    return barbers, services
+
+
+def _get_catalog() -> Tuple[tuple, tuple]:
+    """Return cached (barbers, services), reloading when stale or modified."""
+    return _load_catalog(
+        int(time.time() // CATALOG_CACHE_TTL_SECONDS),
+        BarberService.data_version,
+        ServiceService.data_version
+    )
+
+
+# "HH:MM" labels for every slot start, built once instead of per chip
+SLOT_STRINGS = {
+    (h, m): f"{h:02d}:{m:02d}"
+    for h in range(24)
+    for m in range(0, 60, AppointmentService.SLOT_INTERVAL_MINUTES)
+}
+_SLOT_TOOLTIP_AVAILABLE = "Seleccionar"
+_SLOT_TOOLTIP_UNAVAILABLE = "No disponible - conflicto con otro turno"
+
+_DAYS_ES = ("Lunes", "Martes", "Miércoles", "Jueves", "Viernes", "Sábado", "Domingo")
+_MONTHS_ES = (
+    "", "Enero", "Febrero", "Marzo", "Abril", "Mayo", "Junio",
+    "Julio", "Agosto", "Septiembre", "Octubre", "Noviembre", "Diciembre"
+)
+
+
+@lru_cache(maxsize=64)
+def _format_date(d: date) -> str:
+    """Format date for display."""
+    return f"{_DAYS_ES[d.weekday()]}, {d.day} de {_MONTHS_ES[d.month]} de {d.year}"
+
+
+# Chip styling values shared by every form (value objects, not controls)
+_SERVICE_CHIP_PADDING = ft.padding.symmetric(horizontal=20, vertical=10)
+_SERVICE_CHIP_BORDER = ft.border.all(1, AppTheme.BORDER_DEFAULT)
+_SERVICE_CHIP_SELECTED_BORDER = ft.border.all(2, AppTheme.PRIMARY)
+
+
+def _build_service_chips(services: List[dict], on_select) -> List[ft.Container]:
+    """Build the service chips, calling on_select(service_id) when one is clicked."""
+    return [
+        ft.Container(
+            content=ft.Column(
+                controls=[
+                    ft.Text(service["name"], size=14, weight=ft.FontWeight.BOLD),
+                    ft.Text(f"{service['duration']} min", size=12, color=ft.Colors.GREY_400)
+                ],
+                horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+                spacing=2
+            ),
+            padding=_SERVICE_CHIP_PADDING,
+            border_radius=10,
+            bgcolor=ft.Colors.with_opacity(0.1, ft.Colors.WHITE),
+            border=_SERVICE_CHIP_BORDER,
+            on_click=lambda e, sid=service["id"]: on_select(sid),
+            ink=True,
+            data=service["id"]
+        )
+        for service in services
+    ]
+
+
 def create_new_appointment_view(page: ft.Page, query_params: Optional[str] = None) -> ft.Control:
     """
     Create the new appointment form.
@@ -47,31 +143,31 @@ def create_new_appointment_view(page: ft.Page, query_params: Optional[str] = Non
     selected_client: Optional[dict] = None
     selected_service: Optional[dict] = None
     selected_time: Optional[str] = None
-    available_slots: List[tuple] = []
-    barbers: List[dict] = []
+    slot_grid: Optional[SlotGrid] = None
+    # (barber_id, duration, date) -> (expires_at, SlotGrid)
+    slot_cache: Dict[Tuple[Optional[int], int, str], Tuple[float, SlotGrid]] = {}
+    available_count = 0
+    # Flat list of the rendered time chips, restyled in place on selection
+    time_chips: List[ft.Container] = []
+    # Duration the time chips were last built for
+    last_duration: Optional[int] = None
+    # Dialogs are built on first use and reused afterwards
+    new_client_dialog: Optional[ft.AlertDialog] = None
+    error_dialog: Optional[ft.AlertDialog] = None
+    success_dialog: Optional[ft.AlertDialog] = None
+    search_timer: Optional[threading.Timer] = None
+    last_search_term: Optional[str] = None
 
-    # Load barbers
-    with get_db() as db:
-        db_barbers = db.query(Barber).filter(Barber.is_active == True).all()
-        for b in db_barbers:
-            barbers.append({"id": b.id, "name": b.name, "color": b.color})
+    # Load barbers and services (cached dicts, avoids detached instance errors)
+    cached_barbers, cached_services = _get_catalog()
+    barbers: List[dict] = list(cached_barbers)
+    services: List[dict] = list(cached_services)
+    services_by_id = {s["id"]: s for s in services}
+    barbers_by_id = {b["id"]: b for b in barbers}
     
     if not selected_barber_id and barbers:
         selected_barber_id = barbers[0]["id"]
     
-    # Load services - convert to dicts to avoid detached instance errors
-    services = []
-    with get_db() as db:
-        db_services = ServiceService.get_all_services(db)
-        for s in db_services:
-            services.append({
-                "id": s.id,
-                "name": s.name,
-                "duration": s.duration,
-                "price": s.price,
-                "is_active": s.is_active
-            })
-    
     # Refs for dynamic updates
     client_field_ref = ft.Ref[ft.TextField]()
     client_results_ref = ft.Ref[ft.Column]()
@@ -79,16 +175,18 @@ def create_new_appointment_view(page: ft.Page, query_params: Optional[str] = Non
     service_chips_row_ref = ft.Ref[ft.Row]()
     time_chips_container_ref = ft.Ref[ft.Column]()
     confirm_btn_ref = ft.Ref[ft.ElevatedButton]()
+    time_summary_ref = ft.Ref[ft.Text]()
+    client_name_ref = ft.Ref[ft.Text]()
+    client_email_ref = ft.Ref[ft.Text]()
+    client_phone_ref = ft.Ref[ft.Text]()
     barber_selector_ref = ft.Ref[ft.Row]()
     
-    def format_date(d: date) -> str:
-        """Format date for display."""
-        days_es = ["Lunes", "Martes", "Miércoles", "Jueves", "Viernes", "Sábado", "Domingo"]
-        months_es = [
-            "", "Enero", "Febrero", "Marzo", "Abril", "Mayo", "Junio",
-            "Julio", "Agosto", "Septiembre", "Octubre", "Noviembre", "Diciembre"
-        ]
-        return f"{days_es[d.weekday()]}, {d.day} de {months_es[d.month]} de {d.year}"
+    def slots_summary() -> str:
+        """Summary line shown above the time chips."""
+        return (
+            f"Servicio: {selected_service['name']} ({selected_service['duration']} min) • "
+            f"{available_count} horarios disponibles"
+        )
     
     def update_confirm_button():
         """Update confirm button state."""
@@ -99,41 +197,60 @@ def create_new_appointment_view(page: ft.Page, query_params: Optional[str] = Non
             selected_barber_id is not None
         )
         confirm_btn_ref.current.disabled = not can_confirm
-        page.update()
+        confirm_btn_ref.current.update()
     
     def on_client_search(e: ft.ControlEvent):
-        """Handle client search input."""
+        """Handle client search input, debounced so only the last keystroke queries."""
+        nonlocal search_timer, last_search_term
         search_term = e.control.value
         
+        if search_timer:
+            search_timer.cancel()
+            search_timer = None
+        
         if len(search_term) < 2:
+            last_search_term = None
             client_results_ref.current.controls.clear()
-            page.update()
+            client_results_ref.current.update()
             return
         
-        # Convert to dicts inside session to avoid detached instance errors
-        client_dicts = []
-        with get_db() as db:
-            clients = ClientService.search_clients(db, search_term)
-            for c in clients:
-                client_dicts.append({
-                    "id": c.id,
-                    "name": c.name,
-                    "email": c.email,
-                    "phone": c.phone
-                })
+        # The timer only dispatches: the query runs on the page's worker threads
+        search_timer = threading.Timer(
+            CLIENT_SEARCH_DEBOUNCE_SECONDS, page.run_thread, args=(run_client_search, search_term)
+        )
+        search_timer.daemon = True
+        search_timer.start()
+    
+    def run_client_search(search_term: str):
+        """Query clients and render the results, unless the search text changed meanwhile."""
+        nonlocal last_search_term
+        if search_term == last_search_term:
+            return
+        last_search_term = search_term
+        
+        # Plain rows (not ORM objects): safe to use after the session closes
+        with get_read_db() as db:
+            rows = ClientService.search_clients_autocomplete(db, search_term)
+        
+        # The user kept typing or picked a client while this query ran: a slow
+        # older query must not overwrite newer results
+        if client_field_ref.current.value != search_term:
+            if last_search_term == search_term:
+                last_search_term = None
+            return
         
         client_results_ref.current.controls.clear()
         
-        for client in client_dicts:
+        for row in rows:
             result_item = ft.Container(
                 content=ft.Row(
                     controls=[
                         ft.Icon(ft.Icons.PERSON_OUTLINE, size=20),
                         ft.Column(
                             controls=[
-                                ft.Text(client["name"], size=14),
+                                ft.Text(row.name, size=14),
                                 ft.Text(
-                                    client["phone"] or client["email"],
+                                    row.phone or row.email,
                                     size=12,
                                     color=AppTheme.TEXT_SECONDARY
                                 )
@@ -146,12 +263,12 @@ def create_new_appointment_view(page: ft.Page, query_params: Optional[str] = Non
                 padding=10,
                 border_radius=8,
                 bgcolor=ft.Colors.with_opacity(0.1, ft.Colors.WHITE),
-                on_click=lambda e, c=client: select_client(c),
+                on_click=lambda e, c=row._asdict(): select_client(c),
                 ink=True
             )
             client_results_ref.current.controls.append(result_item)
         
-        if not client_dicts:
+        if not rows:
             client_results_ref.current.controls.append(
                 ft.Container(
                     content=ft.Text(
@@ -163,54 +280,40 @@ def create_new_appointment_view(page: ft.Page, query_params: Optional[str] = Non
                 )
             )
         
-        page.update()
+        client_results_ref.current.update()
     
     def select_client(client: dict):
         """Select a client."""
-        nonlocal selected_client
+        nonlocal selected_client, last_search_term
         selected_client = client
+        last_search_term = None
         
         # Hide search results and show selected card
         client_results_ref.current.controls.clear()
         client_field_ref.current.value = ""
         client_field_ref.current.visible = False
         
-        selected_client_card_ref.current.content = ft.Row(
-            controls=[
-                ft.Container(
-                    content=ft.Icon(ft.Icons.PERSON, color=AppTheme.PRIMARY),
-                    padding=10,
-                    bgcolor=ft.Colors.with_opacity(0.1, AppTheme.PRIMARY),
-                    border_radius=25
-                ),
-                ft.Column(
-                    controls=[
-                        ft.Text(client["name"], size=16, weight=ft.FontWeight.BOLD),
-                        ft.Text(client["email"], size=12, color=ft.Colors.GREY_400),
-                        ft.Text(client["phone"] or "", size=12, color=ft.Colors.GREY_500)
-                    ],
-                    spacing=2,
-                    expand=True
-                ),
-                ft.IconButton(
-                    icon=ft.Icons.CLOSE,
-                    icon_color=ft.Colors.RED_400,
-                    tooltip="Cambiar cliente",
-                    on_click=clear_client
-                )
-            ]
-        )
-        selected_client_card_ref.current.padding = 10
-        selected_client_card_ref.current.border_radius = 8
-        selected_client_card_ref.current.bgcolor = ft.Colors.with_opacity(0.15, AppTheme.PRIMARY)
+        client_name_ref.current.value = client["name"]
+        client_email_ref.current.value = client["email"]
+        client_phone_ref.current.value = client["phone"] or ""
         selected_client_card_ref.current.visible = True
         
+        client_results_ref.current.update()
+        client_field_ref.current.update()
+        selected_client_card_ref.current.update()
         update_confirm_button()
     
     def select_barber(barber_id: int):
         """Update selected barber and refresh slots."""
         nonlocal selected_barber_id
         selected_barber_id = barber_id
+        
+        # Highlight the selected barber with their color
+        for chip in barber_selector_ref.current.controls:
+            color = barbers_by_id[chip.data]["color"]
+            chip.bgcolor = color if chip.data == barber_id else ft.Colors.with_opacity(0.1, color)
+        barber_selector_ref.current.update()
+        
         update_time_slots()
         update_confirm_button()
 
@@ -220,52 +323,75 @@ def create_new_appointment_view(page: ft.Page, query_params: Optional[str] = Non
         selected_client = None
         selected_client_card_ref.current.visible = False
         client_field_ref.current.visible = True
+        selected_client_card_ref.current.update()
+        client_field_ref.current.update()
         update_confirm_button()
     
     def select_service(service_id: int):
         """Select a service by ID and update time slots."""
         nonlocal selected_service
         
-        # Find the service by ID
-        selected_service = next((s for s in services if s["id"] == service_id), None)
+        selected_service = services_by_id.get(service_id)
         if not selected_service:
             return
         
-        # Update chip styles
+        style_service_chips(service_id)
+        service_chips_row_ref.current.update()
+        
+        # Same duration means the same slots: only the summary text changes
+        if selected_service["duration"] == last_duration:
+            time_summary_ref.current.value = slots_summary()
+            time_summary_ref.current.update()
+        else:
+            update_time_slots()
+        update_confirm_button()
+    
+    def style_service_chips(service_id: int):
+        """Highlight the chip of the selected service."""
         for chip in service_chips_row_ref.current.controls:
             if chip.data == service_id:
                 chip.bgcolor = AppTheme.PRIMARY
-                chip.border = ft.border.all(2, AppTheme.PRIMARY)
+                chip.border = _SERVICE_CHIP_SELECTED_BORDER
                 chip.content.controls[1].color = AppTheme.BTN_TEXT
             else:
                 chip.bgcolor = ft.Colors.with_opacity(0.05, ft.Colors.WHITE)
-                chip.border = ft.border.all(1, AppTheme.BORDER_DEFAULT)
+                chip.border = _SERVICE_CHIP_BORDER
                 chip.content.controls[1].color = AppTheme.TEXT_SECONDARY
-        
-        update_time_slots()
-        update_confirm_button()
     
     def update_time_slots():
         """Update time slots based on selected service."""
-        nonlocal available_slots
-        
         if not selected_service:
             return
         
-        with get_db() as db:
-            available_slots = AppointmentService.get_available_slots(
-                db, 
-                initial_date, 
-                selected_service["duration"],
-                barber_id=selected_barber_id
-            )
+        build_time_slots()
+        time_chips_container_ref.current.update()
+    
+    def build_time_slots():
+        """Build the time chips for the selected service without sending them to the client."""
+        nonlocal slot_grid, available_count, time_chips, last_duration
+        
+        cache_key = (selected_barber_id, selected_service["duration"], initial_date.isoformat())
+        cached = slot_cache.get(cache_key)
+        if cached and cached[0] > time.monotonic():
+            slot_grid = cached[1]
+        else:
+            with get_read_db() as db:
+                slot_grid = AppointmentService.get_available_slots(
+                    db, 
+                    initial_date, 
+                    selected_service["duration"],
+                    barber_id=selected_barber_id
+                )
+            slot_cache[cache_key] = (time.monotonic() + SLOT_CACHE_TTL_SECONDS, slot_grid)
         
         # Build time chips grouped by hour
         time_rows = []
         current_hour = None
         current_row_chips = []
+        time_chips = []
         
-        for hour, minute, is_available in available_slots:
+        for index, (hour, minute) in enumerate(slot_grid.times):
+            is_available = slot_grid.is_available(index)
             if current_hour != hour:
                 if current_row_chips:
                     time_rows.append(
@@ -278,8 +404,8 @@ def create_new_appointment_view(page: ft.Page, query_params: Optional[str] = Non
                 current_row_chips = []
                 current_hour = hour
             
-            time_str = f"{hour:02d}:{minute:02d}"
-            is_selected = selected_time == time_str
+            time_str = SLOT_STRINGS.get((hour, minute)) or f"{hour:02d}:{minute:02d}"
+            is_selected = is_available and selected_time == time_str
             
             chip = ft.Container(
                 content=ft.Text(
@@ -299,13 +425,11 @@ def create_new_appointment_view(page: ft.Page, query_params: Optional[str] = Non
                     (lambda e, t=time_str: select_time(t)) if is_available else None
                 ),
                 ink=is_available,
-                tooltip=(
-                    "Seleccionar" if is_available else 
-                    "No disponible - conflicto con otro turno"
-                ),
+                tooltip=_SLOT_TOOLTIP_AVAILABLE if is_available else _SLOT_TOOLTIP_UNAVAILABLE,
                 data={"time": time_str, "available": is_available}  # Store data for style updates
             )
             current_row_chips.append(chip)
+            time_chips.append(chip)
         
         # Add last row
         if current_row_chips:
@@ -318,59 +442,50 @@ def create_new_appointment_view(page: ft.Page, query_params: Optional[str] = Non
             )
         
         # Count available slots
-        available_count = sum(1 for _, _, avail in available_slots if avail)
+        available_count = slot_grid.available_count
+        
+        last_duration = selected_service["duration"]
         
         time_chips_container_ref.current.controls = [
             ft.Text(
-                f"Servicio: {selected_service['name']} ({selected_service['duration']} min) • "
-                f"{available_count} horarios disponibles",
+                slots_summary(),
                 size=12,
-                color=AppTheme.TEXT_SECONDARY
+                color=AppTheme.TEXT_SECONDARY,
+                ref=time_summary_ref
             ),
             ft.Divider(height=10),
             *time_rows
         ]
-        
-        page.update()
-        
-        # Note: Pre-selection of initial_time is handled at service selection level
-        # Do NOT call select_time() from here to avoid recursion
     
     def select_time(time_str: str):
         """Select a time slot."""
         nonlocal selected_time
+        previous_time = selected_time
         selected_time = time_str
         
-        # Update styling visually without rebuilding controls (avoids recursion)
-        if time_chips_container_ref.current:
-            for control in time_chips_container_ref.current.controls:
-                if isinstance(control, ft.Row):
-                    for chip in control.controls:
-                        if isinstance(chip, ft.Container) and chip.data:
-                            is_match = chip.data.get("time") == time_str
-                            is_avail = chip.data.get("available")
-                            
-                            chip.bgcolor = (
-                                AppTheme.PRIMARY if is_match else
-                                ft.Colors.with_opacity(0.3, AppTheme.PRIMARY) if is_avail else
-                                ft.Colors.with_opacity(0.05, ft.Colors.WHITE)
-                            )
-                            # Text color is white for both selected and available states
+        # Restyle only the previously selected chip and the new one, in place
+        for chip in time_chips:
+            chip_time = chip.data["time"]
+            if chip_time != time_str and chip_time != previous_time:
+                continue
+            chip.bgcolor = (
+                AppTheme.PRIMARY if chip_time == time_str else
+                ft.Colors.with_opacity(0.3, AppTheme.PRIMARY) if chip.data["available"] else
+                ft.Colors.with_opacity(0.05, ft.Colors.WHITE)
+            )
+            # Text color is white for both selected and available states
+            chip.update()
         
         update_confirm_button()
-        page.update()
     
     def confirm_appointment(e):
         """Confirm and create the appointment."""
         if not all([selected_client, selected_service, selected_time]):
             return
         
-        # Parse time
-        hour, minute = map(int, selected_time.split(":"))
-        start_time = datetime.combine(
-            initial_date,
-            datetime.min.time().replace(hour=hour, minute=minute)
-        )
+        # Parse time (always "HH:MM", built by the time chips)
+        hour, minute = int(selected_time[:2]), int(selected_time[3:])
+        start_time = datetime(initial_date.year, initial_date.month, initial_date.day, hour, minute)
         
         # Create appointment
         with get_db() as db:
@@ -380,161 +495,174 @@ def create_new_appointment_view(page: ft.Page, query_params: Optional[str] = Non
                 service_id=selected_service["id"],
                 barber_id=selected_barber_id,
                 start_time=start_time,
-                sync_to_google=True
+                sync_to_google=False
             )
             
             if error:
                 show_error_dialog(error)
                 return
+            appointment_id = appointment.id
         
+        # The new booking changes availability for every cached combination
+        slot_cache.clear()
         show_success_dialog()
+        
+        # The appointment is committed: sync to Google without blocking the UI
+        page.run_thread(sync_to_google_in_background, appointment_id)
+    
+    def sync_to_google_in_background(appointment_id: int):
+        """Create the Google Calendar event and report a failure without blocking."""
+        try:
+            with get_db() as db:
+                synced = AppointmentService.sync_new_appointment(db, appointment_id)
+        except Exception:
+            logger.exception(f"Error sincronizando el turno {appointment_id} con Google Calendar")
+            synced = False
+        
+        if not synced:
+            page.snack_bar = ft.SnackBar(
+                content=ft.Text("El turno se guardó, pero no se pudo sincronizar con Google Calendar"),
+                bgcolor=ft.Colors.ORANGE_700
+            )
+            page.snack_bar.open = True
+            page.update()
+    
+    def open_dialog(dialog: ft.AlertDialog):
+        """Open one of this form's dialogs, adding it to the overlay only once."""
+        if dialog not in page.overlay:
+            page.overlay.append(dialog)
+        dialog.open = True
+        page.update()
+    
+    def close_dialog(dialog: ft.AlertDialog):
+        """Close a dialog, keeping it in the overlay for reuse."""
+        dialog.open = False
+        page.update()
+    
+    def leave_form(e=None):
+        """Drop this form's dialogs from the overlay and return to the agenda."""
+        for dialog in (new_client_dialog, error_dialog, success_dialog):
+            if dialog is not None:
+                dialog.open = False
+                if dialog in page.overlay:
+                    page.overlay.remove(dialog)
+        page.go("/")
     
     def show_new_client_dialog(e):
         """Show dialog to create a new client."""
-        name_field = ft.TextField(label="Nombre", autofocus=True, border_color=AppTheme.BORDER_DEFAULT, focused_border_color=AppTheme.BORDER_FOCUS)
-        email_field = ft.TextField(label="Email", border_color=AppTheme.BORDER_DEFAULT, focused_border_color=AppTheme.BORDER_FOCUS)
-        phone_field = ft.TextField(label="Teléfono", border_color=AppTheme.BORDER_DEFAULT, focused_border_color=AppTheme.BORDER_FOCUS)
-        error_text = ft.Text("", color=AppTheme.TEXT_ERROR, visible=False)
+        nonlocal new_client_dialog
         
-        def close_dialog(e):
-            dialog.open = False
-            page.update()
-        
-        def save_client(e):
-            with get_db() as db:
-                client, error = ClientService.create_client(
-                    db,
-                    name=name_field.value,
-                    email=email_field.value,
-                    phone=phone_field.value
-                )
-                
-                if error:
-                    error_text.value = error
-                    error_text.visible = True
-                    page.update()
-                    return
+        if new_client_dialog is None:
+            name_field = ft.TextField(label="Nombre", autofocus=True, border_color=AppTheme.BORDER_DEFAULT, focused_border_color=AppTheme.BORDER_FOCUS)
+            email_field = ft.TextField(label="Email", border_color=AppTheme.BORDER_DEFAULT, focused_border_color=AppTheme.BORDER_FOCUS)
+            phone_field = ft.TextField(label="Teléfono", border_color=AppTheme.BORDER_DEFAULT, focused_border_color=AppTheme.BORDER_FOCUS)
+            error_text = ft.Text("", color=AppTheme.TEXT_ERROR, visible=False)
+            
+            def save_client(e):
+                with get_db() as db:
+                    client, error = ClientService.create_client(
+                        db,
+                        name=name_field.value,
+                        email=email_field.value,
+                        phone=phone_field.value
+                    )
+                    
+                    if error:
+                        error_text.value = error
+                        error_text.visible = True
+                        error_text.update()
+                        return
+                    
+                    # Convert to dict before session closes
+                    client_dict = {
+                        "id": client.id,
+                        "name": client.name,
+                        "email": client.email,
+                        "phone": client.phone
+                    }
                 
-                # Convert to dict before session closes
-                client_dict = {
-                    "id": client.id,
-                    "name": client.name,
-                    "email": client.email,
-                    "phone": client.phone
-                }
+                # Call select_client outside the session with serialized data
+                select_client(client_dict)
+                close_dialog(new_client_dialog)
             
-            # Call select_client outside the session with serialized data
-            select_client(client_dict)
-            dialog.open = False
-            page.update()
-        
-        dialog = ft.AlertDialog(
-            modal=True,
-            title=ft.Text("Nuevo Cliente"),
-            content=ft.Column(
-                controls=[name_field, email_field, phone_field, error_text],
-                tight=True,
-                spacing=15
-            ),
-            actions=[
-                ft.TextButton("Cancelar", on_click=close_dialog),
-                ft.ElevatedButton(
-                    content=ft.Text("Guardar", color=AppTheme.BTN_TEXT),
-                    on_click=save_client,
-                    style=ft.ButtonStyle(bgcolor=AppTheme.PRIMARY, color=AppTheme.BTN_TEXT)
-                )
-            ]
-        )
+            new_client_dialog = ft.AlertDialog(
+                modal=True,
+                title=ft.Text("Nuevo Cliente"),
+                content=ft.Column(
+                    controls=[name_field, email_field, phone_field, error_text],
+                    tight=True,
+                    spacing=15
+                ),
+                actions=[
+                    ft.TextButton("Cancelar", on_click=lambda e: close_dialog(new_client_dialog)),
+                    ft.ElevatedButton(
+                        content=ft.Text("Guardar", color=AppTheme.BTN_TEXT),
+                        on_click=save_client,
+                        style=ft.ButtonStyle(bgcolor=AppTheme.PRIMARY, color=AppTheme.BTN_TEXT)
+                    )
+                ]
+            )
+        else:
+            # Reused dialog: start from an empty form
+            name_field, email_field, phone_field, error_text = new_client_dialog.content.controls
+            name_field.value = email_field.value = phone_field.value = ""
+            error_text.visible = False
         
-        page.overlay.append(dialog)
-        dialog.open = True
-        page.update()
+        open_dialog(new_client_dialog)
     
     def show_error_dialog(message: str):
         """Show error dialog."""
-        def close_dialog(e):
-            dialog.open = False
-            page.update()
+        nonlocal error_dialog
         
-        dialog = ft.AlertDialog(
-            modal=True,
-            title=ft.Row(
-                controls=[
-                    ft.Icon(ft.Icons.ERROR, color=AppTheme.TEXT_ERROR),
-                    ft.Text("Error")
+        if error_dialog is None:
+            error_dialog = ft.AlertDialog(
+                modal=True,
+                title=ft.Row(
+                    controls=[
+                        ft.Icon(ft.Icons.ERROR, color=AppTheme.TEXT_ERROR),
+                        ft.Text("Error")
+                    ]
+                ),
+                content=ft.Text(),
+                actions=[
+                    ft.TextButton("Cerrar", on_click=lambda e: close_dialog(error_dialog))
                 ]
-            ),
-            content=ft.Text(message),
-            actions=[
-                ft.TextButton("Cerrar", on_click=close_dialog)
-            ]
-        )
-        page.overlay.append(dialog)
-        dialog.open = True
-        page.update()
+            )
+        error_dialog.content.value = message
+        open_dialog(error_dialog)
     
     def show_success_dialog():
         """Show success dialog."""
-        def go_to_agenda(e):
-            dialog.open = False
-            page.go("/")
+        nonlocal success_dialog
         
-        dialog = ft.AlertDialog(
-            modal=True,
-            title=ft.Row(
-                controls=[
-                    ft.Icon(ft.Icons.CHECK_CIRCLE, color=AppTheme.PRIMARY),
-                    ft.Text("¡Turno Creado!")
+        if success_dialog is None:
+            success_dialog = ft.AlertDialog(
+                modal=True,
+                title=ft.Row(
+                    controls=[
+                        ft.Icon(ft.Icons.CHECK_CIRCLE, color=AppTheme.PRIMARY),
+                        ft.Text("¡Turno Creado!")
+                    ]
+                ),
+                content=ft.Text(),
+                actions=[
+                    ft.ElevatedButton(
+                        content=ft.Text("Volver a la Agenda", color=AppTheme.BTN_TEXT),
+                        on_click=leave_form,
+                        style=ft.ButtonStyle(bgcolor=AppTheme.PRIMARY, color=AppTheme.BTN_TEXT)
+                    )
                 ]
-            ),
-            content=ft.Text(
-                f"El turno para {selected_client['name']} ha sido agendado "
-                f"para las {selected_time}."
-            ),
-            actions=[
-                ft.ElevatedButton(
-                    content=ft.Text("Volver a la Agenda", color=AppTheme.BTN_TEXT),
-                    on_click=go_to_agenda,
-                    style=ft.ButtonStyle(bgcolor=AppTheme.PRIMARY, color=AppTheme.BTN_TEXT)
-                )
-            ]
+            )
+        success_dialog.content.value = (
+            f"El turno para {selected_client['name']} ha sido agendado "
+            f"para las {selected_time}."
         )
-        page.overlay.append(dialog)
-        dialog.open = True
-        page.update()
+        open_dialog(success_dialog)
     
-    # Build service chips
-    service_chips = []
-    for service in services:
-        chip = ft.Container(
-            content=ft.Column(
-                controls=[
-                    ft.Text(
-                        service["name"],
-                        size=14,
-                        weight=ft.FontWeight.BOLD
-                    ),
-                    ft.Text(
-                        f"{service['duration']} min",
-                        size=12,
-                        color=ft.Colors.GREY_400
-                    )
-                ],
-                horizontal_alignment=ft.CrossAxisAlignment.CENTER,
-                spacing=2
-            ),
-            padding=ft.padding.symmetric(horizontal=20, vertical=10),
-            border_radius=10,
-            bgcolor=ft.Colors.with_opacity(0.1, ft.Colors.WHITE),
-            border=ft.border.all(1, AppTheme.BORDER_DEFAULT),
-            on_click=lambda e, sid=service["id"]: select_service(sid),
-            ink=True,
-            data=service["id"]
-        )
-        service_chips.append(chip)
+    service_chips = _build_service_chips(services, select_service)
     
     # Build the form
-    return ft.Container(
+    view = ft.Container(
         content=ft.Column(
             controls=[
                 # Header
@@ -542,7 +670,7 @@ def create_new_appointment_view(page: ft.Page, query_params: Optional[str] = Non
                     controls=[
                         ft.IconButton(
                             icon=ft.Icons.ARROW_BACK,
-                            on_click=lambda e: page.go("/"),
+                            on_click=leave_form,
                             tooltip="Volver"
                         ),
                         ft.Text(
@@ -553,7 +681,7 @@ def create_new_appointment_view(page: ft.Page, query_params: Optional[str] = Non
                     ]
                 ),
                 ft.Text(
-                    format_date(initial_date),
+                    _format_date(initial_date),
                     size=14,
                     color=AppTheme.TEXT_SECONDARY
                 ),
@@ -578,7 +706,39 @@ def create_new_appointment_view(page: ft.Page, query_params: Optional[str] = Non
                                     )
                                 ]
                             ),
-                            ft.Container(visible=False, ref=selected_client_card_ref),
+                            # Selected client card: built once, filled in by select_client
+                            ft.Container(
+                                content=ft.Row(
+                                    controls=[
+                                        ft.Container(
+                                            content=ft.Icon(ft.Icons.PERSON, color=AppTheme.PRIMARY),
+                                            padding=10,
+                                            bgcolor=ft.Colors.with_opacity(0.1, AppTheme.PRIMARY),
+                                            border_radius=25
+                                        ),
+                                        ft.Column(
+                                            controls=[
+                                                ft.Text(size=16, weight=ft.FontWeight.BOLD, ref=client_name_ref),
+                                                ft.Text(size=12, color=ft.Colors.GREY_400, ref=client_email_ref),
+                                                ft.Text(size=12, color=ft.Colors.GREY_500, ref=client_phone_ref)
+                                            ],
+                                            spacing=2,
+                                            expand=True
+                                        ),
+                                        ft.IconButton(
+                                            icon=ft.Icons.CLOSE,
+                                            icon_color=ft.Colors.RED_400,
+                                            tooltip="Cambiar cliente",
+                                            on_click=clear_client
+                                        )
+                                    ]
+                                ),
+                                padding=10,
+                                border_radius=8,
+                                bgcolor=ft.Colors.with_opacity(0.15, AppTheme.PRIMARY),
+                                visible=False,
+                                ref=selected_client_card_ref
+                            ),
                             ft.TextField(
                                 label="Buscar Cliente (Nombre o Teléfono)",
                                 prefix_icon=ft.Icons.SEARCH,
@@ -631,10 +791,12 @@ def create_new_appointment_view(page: ft.Page, query_params: Optional[str] = Non
                                                 padding=ft.padding.symmetric(horizontal=12, vertical=5),
                                                 bgcolor=b["color"] if b["id"] == selected_barber_id else ft.Colors.with_opacity(0.1, b["color"]),
                                                 border_radius=5,
-                                                on_click=lambda e, bid=b["id"]: select_barber(bid)
+                                                on_click=lambda e, bid=b["id"]: select_barber(bid),
+                                                data=b["id"]
                                             ) for b in barbers
                                         ],
-                                        spacing=5
+                                        spacing=5,
+                                        ref=barber_selector_ref
                                     )
                                 ]
                             )
@@ -714,3 +876,15 @@ def create_new_appointment_view(page: ft.Page, query_params: Optional[str] = Non
         padding=20,
         expand=True
     )
+    
+    # Coming from an agenda slot: ship the first render with the default
+    # service and the requested time already selected
+    if initial_time and services:
+        selected_service = services[0]
+        selected_time = initial_time
+        style_service_chips(selected_service["id"])
+        build_time_slots()
+        if not any(c.data["time"] == initial_time and c.data["available"] for c in time_chips):
+            selected_time = None
+    
+    return view
@@ -3,13 +3,131 @@ Reports view for Barber Manager.
 Dashboard with daily cash register (arqueo de caja) and period analytics.
 """
 import flet as ft
+import threading
+import time
 from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import List, Optional, Tuple
+from config import logger
 from database import get_db
 from repositories.appointment_repository import AppointmentRepository
+from services.appointment_service import AppointmentService
+from services.barber_service import BarberService
+from services.service_service import ServiceService
+from utils.report_cache import report_cache
 from utils.theme import AppTheme
 
 appointment_repo = AppointmentRepository()
 
+# Ranges that include today can still change without a write through the app
+# (e.g. another instance): recompute those at least this often
+STATS_CACHE_TTL_SECONDS = 60
+
+# Bound once instead of parsing an f-string format spec per value
+_format_money = "${:.2f}".format
+
+# Picker/mode changes within this window collapse into a single refresh
+REFRESH_DEBOUNCE_SECONDS = 0.25
+
+# Page attribute holding the report date pickers: created on the first visit,
+# reused by later ones instead of adding three new pickers to the overlay each time.
+# Stored on the page itself so they are freed with it.
+_DATE_PICKERS_ATTR = "_report_date_pickers"
+
+# Top barbers shown by income; the rest appear with "Ver más"
+BARBER_TABLE_LIMIT = 10
+
+# Barber rows allocated up front; the pool grows when "Ver más" needs more
+BARBER_ROW_POOL_SIZE = BARBER_TABLE_LIMIT
+
+# Fixed column widths (px) of the barber performance table: name, count, income
+BARBER_COLUMN_WIDTHS = (220, 120, 140)
+_NUMERIC_ALIGNMENT = ft.Alignment(1, 0)
+
+
+def _barber_row(name: str, count: str, income: str, ref: Optional[ft.Ref] = None, **text_style) -> ft.Row:
+    """
+    Build one row of the barber performance table as plain Texts in fixed-width cells.
+    Much lighter than a DataTable row; text_style is applied to the three Texts.
+    """
+    name_width, count_width, income_width = BARBER_COLUMN_WIDTHS
+    return ft.Row(
+        controls=[
+            ft.Container(ft.Text(name, **text_style), width=name_width),
+            ft.Container(ft.Text(count, **text_style), width=count_width, alignment=_NUMERIC_ALIGNMENT),
+            ft.Container(ft.Text(income, **text_style), width=income_width, alignment=_NUMERIC_ALIGNMENT),
+        ],
+        spacing=0,
+        ref=ref
+    )
+
+
+@lru_cache(maxsize=64)
+def _load_stats(start: date, end: date, data_versions: Tuple[int, int, int], ts_bucket: int) -> Tuple[dict, List[dict]]:
+    """
+    Fetch (stats by status, top confirmed barber performance) for a date range.
+    Only BARBER_TABLE_LIMIT + 1 barbers are read: the extra one tells the view
+    whether "Ver más" has more to fetch (see _load_all_barber_stats).
+    Cached per range; data_versions and ts_bucket only take part in the key.
+    Ranges that ended before today are also kept in the on-disk report cache,
+    so they survive restarts. The returned objects are shared between callers
+    and must not be mutated.
+    """
+    persist = end < date.today()
+    disk_key = f"{start.isoformat()}:{end.isoformat()}"
+    report = report_cache.get(disk_key) if persist else None
+    if report is None:
+        # A commit while querying clears the disk cache; the result is then not stored
+        generation = report_cache.generation
+        with get_db() as db:
+            report = {
+                "status_stats": appointment_repo.get_stats_by_status(db, start, end),
+                "barber_stats": appointment_repo.get_barber_performance(
+                    db, start, end, status="confirmed", limit=BARBER_TABLE_LIMIT + 1
+                ),
+            }
+        if persist:
+            report_cache.set(disk_key, report, generation)
+    return report["status_stats"], report["barber_stats"]
+
+
+def get_stats(start: date, end: date) -> Tuple[dict, List[dict]]:
+    """
+    Return cached statistics, refetching after any appointment/service/barber write.
+    Cache misses rely on the idx_appointment_report index.
+    """
+    data_versions = (
+        AppointmentService.data_version,
+        ServiceService.data_version,
+        BarberService.data_version
+    )
+    ts_bucket = int(time.time() // STATS_CACHE_TTL_SECONDS) if end >= date.today() else 0
+    return _load_stats(start, end, data_versions, ts_bucket)
+
+
+def _load_all_barber_stats(start: date, end: date) -> List[dict]:
+    """Fetch the confirmed performance of every barber in a range, for "Ver más"."""
+    with get_db() as db:
+        return appointment_repo.get_barber_performance(db, start, end, status="confirmed")
+
+
+def _get_date_pickers(page: ft.Page) -> Tuple[ft.DatePicker, ft.DatePicker, ft.DatePicker]:
+    """
+    Return the page's (date, period start, period end) pickers, creating them on first use.
+    The caller rebinds on_change and value to its own view.
+    """
+    pickers = getattr(page, _DATE_PICKERS_ATTR, None)
+    if pickers is None:
+        pickers = tuple(ft.DatePicker(first_date=date(2020, 1, 1)) for _ in range(3))
+        setattr(page, _DATE_PICKERS_ATTR, pickers)
+    for picker in pickers:
+        picker.last_date = date.today()
+        # Other views clear the overlay when they open a dialog
+        if picker not in page.overlay:
+            page.overlay.append(picker)
+    return pickers
+
+
 def create_reports_view(page: ft.Page) -> ft.Control:
     """
     Create the reports/analytics dashboard with daily and period views.
@@ -28,23 +146,36 @@ def create_reports_view(page: ft.Page) -> ft.Control:
     period_row = ft.Ref[ft.Row]()
     period_start_text = ft.Ref[ft.Text]()
     period_end_text = ft.Ref[ft.Text]()
+    loading_ring = ft.Ref[ft.ProgressRing]()
+    # Incremented per refresh so late results of an older refresh are dropped
+    refresh_generation = 0
+    refresh_timer: Optional[threading.Timer] = None
+    # (mode, start, end) of the stats last requested; same selection again is a no-op
+    last_refresh_key: Optional[Tuple[str, date, date]] = None
     
-    def get_stats(start: date, end: date):
-        """Fetch statistics grouped by status for the given date range."""
-        with get_db() as db:
-            stats = appointment_repo.get_stats_by_status(db, start, end)
-            barber_stats = appointment_repo.get_barber_performance(db, start, end, status="confirmed")
-        return stats, barber_stats
-
-    def create_stat_card(title: str, value: str, subtitle: str, icon: str, color: str):
+    # Stats widgets: built once, refreshed by assigning Text values
+    period_label_text = ft.Ref[ft.Text]()
+    card_value_texts = {status: ft.Ref[ft.Text]() for status in ("confirmed", "pending", "cancelled")}
+    card_subtitle_texts = {status: ft.Ref[ft.Text]() for status in ("confirmed", "pending", "cancelled")}
+    total_count_text = ft.Ref[ft.Text]()
+    total_income_text = ft.Ref[ft.Text]()
+    barber_table = ft.Ref[ft.Column]()
+    barber_empty_row = ft.Ref[ft.Row]()
+    # Pool of barber rows, reused across refreshes: (row, name, count, income)
+    barber_row_pool: List[Tuple[ft.Row, ft.Text, ft.Text, ft.Text]] = []
+    # Date range of the stats on screen; "Ver más" fetches its remaining barbers
+    shown_range: Optional[Tuple[date, date]] = None
+    show_more_button = ft.Ref[ft.TextButton]()
+    
+    def create_stat_card(title: str, icon: str, color: str, value_ref: ft.Ref, subtitle_ref: ft.Ref):
         """Create a statistics card with income subtitle."""
         return ft.Container(
             content=ft.Column(
                 controls=[
                     ft.Icon(icon, color=color, size=28),
                     ft.Text(title, size=13, color=AppTheme.TEXT_SECONDARY),
-                    ft.Text(value, size=26, weight=ft.FontWeight.BOLD),
-                    ft.Text(subtitle, size=12, color=color),
+                    ft.Text(size=26, weight=ft.FontWeight.BOLD, ref=value_ref),
+                    ft.Text(size=12, color=color, ref=subtitle_ref),
                 ],
                 horizontal_alignment=ft.CrossAxisAlignment.CENTER,
                 spacing=4
@@ -54,40 +185,40 @@ def create_reports_view(page: ft.Page) -> ft.Control:
             border_radius=12,
             expand=True
         )
+    
+    def add_barber_row():
+        """Grow the barber row pool by one hidden row."""
+        row = _barber_row("", "", "")
+        row.visible = False
+        name_text, count_text, income_text = (cell.content for cell in row.controls)
+        barber_row_pool.append((row, name_text, count_text, income_text))
+        barber_table.current.controls.append(row)
 
-    def build_stats_content(start: date, end: date, is_daily: bool):
-        """Build the statistics content for display."""
-        stats, barber_stats = get_stats(start, end)
-        
-        # Period label
-        if is_daily:
-            period_label = f"📅 Arqueo de Caja - {start.strftime('%A %d/%m/%Y').capitalize()}"
-        else:
-            period_label = f"📊 Reporte: {start.strftime('%d/%m/%Y')} al {end.strftime('%d/%m/%Y')}"
-        
+    def build_stats_layout():
+        """Build the statistics controls once; update_stats_content fills them in."""
         # Status cards row
         status_cards = ft.Row(
             controls=[
                 create_stat_card(
-                    "💰 Caja (Confirmados)", 
-                    str(stats["confirmed"]["count"]),
-                    f"${stats['confirmed']['income']:.2f}",
-                    ft.Icons.CHECK_CIRCLE, 
-                    AppTheme.PRIMARY
+                    "💰 Caja (Confirmados)",
+                    ft.Icons.CHECK_CIRCLE,
+                    AppTheme.PRIMARY,
+                    card_value_texts["confirmed"],
+                    card_subtitle_texts["confirmed"]
                 ),
                 create_stat_card(
-                    "⏳ Pendientes", 
-                    str(stats["pending"]["count"]),
-                    f"${stats['pending']['income']:.2f} esperado",
-                    ft.Icons.SCHEDULE, 
-                    ft.Colors.ORANGE_400
+                    "⏳ Pendientes",
+                    ft.Icons.SCHEDULE,
+                    ft.Colors.ORANGE_400,
+                    card_value_texts["pending"],
+                    card_subtitle_texts["pending"]
                 ),
                 create_stat_card(
-                    "❌ Cancelados", 
-                    str(stats["cancelled"]["count"]),
-                    "Sin recaudación",
-                    ft.Icons.CANCEL, 
-                    AppTheme.TEXT_ERROR
+                    "❌ Cancelados",
+                    ft.Icons.CANCEL,
+                    AppTheme.TEXT_ERROR,
+                    card_value_texts["cancelled"],
+                    card_subtitle_texts["cancelled"]
                 ),
             ],
             spacing=15
@@ -99,17 +230,13 @@ def create_reports_view(page: ft.Page) -> ft.Control:
                 controls=[
                     ft.Icon(ft.Icons.SUMMARIZE, color=ft.Colors.BLUE_400, size=24),
                     ft.Text("Total del día:", size=16, weight=ft.FontWeight.W_500),
-                    ft.Text(
-                        f"{stats['total']['count']} turnos", 
-                        size=16,
-                        color=AppTheme.TEXT_SECONDARY
-                    ),
+                    ft.Text(size=16, color=AppTheme.TEXT_SECONDARY, ref=total_count_text),
                     ft.Container(expand=True),
                     ft.Text(
-                        f"Recaudación real: ${stats['confirmed']['income']:.2f}",
                         size=18,
                         weight=ft.FontWeight.BOLD,
-                        color=AppTheme.PRIMARY
+                        color=AppTheme.PRIMARY,
+                        ref=total_income_text
                     ),
                 ],
                 alignment=ft.MainAxisAlignment.START,
@@ -120,40 +247,32 @@ def create_reports_view(page: ft.Page) -> ft.Control:
             border_radius=10,
         )
         
-        # Barber performance table (only confirmed appointments)
-        if barber_stats:
-            barber_rows = [
-                ft.DataRow(
-                    cells=[
-                        ft.DataCell(ft.Text(b["name"])),
-                        ft.DataCell(ft.Text(str(b["count"]))),
-                        ft.DataCell(ft.Text(f"${b['income']:.2f}")),
-                    ]
-                ) for b in barber_stats
-            ]
-        else:
-            barber_rows = [
-                ft.DataRow(
-                    cells=[
-                        ft.DataCell(ft.Text("Sin turnos confirmados", color=AppTheme.TEXT_SECONDARY)),
-                        ft.DataCell(ft.Text("-")),
-                        ft.DataCell(ft.Text("-")),
-                    ]
-                )
-            ]
-        
-        barber_table = ft.DataTable(
-            columns=[
-                ft.DataColumn(ft.Text("Barbero")),
-                ft.DataColumn(ft.Text("Turnos Atendidos"), numeric=True),
-                ft.DataColumn(ft.Text("Recaudación"), numeric=True),
+        # Barber performance table (only confirmed appointments).
+        # Header, then the empty-state placeholder; pooled rows follow.
+        empty_row = _barber_row("Sin turnos confirmados", "-", "-", ref=barber_empty_row)
+        empty_row.controls[0].content.color = AppTheme.TEXT_SECONDARY
+        table = ft.Column(
+            controls=[
+                _barber_row("Barbero", "Turnos Atendidos", "Recaudación", weight=ft.FontWeight.BOLD),
+                ft.Divider(height=1),
+                empty_row,
             ],
-            rows=barber_rows,
-            expand=True
+            spacing=10,
+            ref=barber_table
+        )
+        for _ in range(BARBER_ROW_POOL_SIZE):
+            add_barber_row()
+        
+        show_more = ft.TextButton(
+            content=ft.Text("Ver más"),
+            icon=ft.Icons.EXPAND_MORE,
+            on_click=show_all_barbers,
+            visible=False,
+            ref=show_more_button
         )
         
         return [
-            ft.Text(period_label, size=20, weight=ft.FontWeight.BOLD),
+            ft.Text(size=20, weight=ft.FontWeight.BOLD, ref=period_label_text),
             ft.Container(height=10),
             status_cards,
             ft.Container(height=15),
@@ -161,16 +280,83 @@ def create_reports_view(page: ft.Page) -> ft.Control:
             ft.Container(height=25),
             ft.Text("💈 Desempeño por Barbero (solo confirmados)", size=16, weight=ft.FontWeight.BOLD),
             ft.Container(
-                content=barber_table,
+                content=table,
                 bgcolor=ft.Colors.with_opacity(0.02, ft.Colors.WHITE),
                 padding=10,
                 border_radius=10
-            )
+            ),
+            show_more
         ]
 
+    def build_period_label(start: date, end: date, is_daily: bool) -> str:
+        """Title shown above the statistics."""
+        if is_daily:
+            return f"📅 Arqueo de Caja - {start.strftime('%A %d/%m/%Y').capitalize()}"
+        return f"📊 Reporte: {start.strftime('%d/%m/%Y')} al {end.strftime('%d/%m/%Y')}"
+
+    def update_stats_content(stats: dict, barber_stats: List[dict], period_label: str):
+        """Fill the statistics controls without rebuilding them."""
+        period_label_text.current.value = period_label
+        
+        confirmed = stats["confirmed"]
+        pending = stats["pending"]
+        confirmed_income = _format_money(confirmed["income"])
+        
+        card_value_texts["confirmed"].current.value = str(confirmed["count"])
+        card_subtitle_texts["confirmed"].current.value = confirmed_income
+        card_value_texts["pending"].current.value = str(pending["count"])
+        card_subtitle_texts["pending"].current.value = _format_money(pending["income"]) + " esperado"
+        card_value_texts["cancelled"].current.value = str(stats["cancelled"]["count"])
+        card_subtitle_texts["cancelled"].current.value = "Sin recaudación"
+        
+        total_count_text.current.value = f"{stats['total']['count']} turnos"
+        total_income_text.current.value = "Recaudación real: " + confirmed_income
+        
+        barber_empty_row.current.visible = not barber_stats
+        show_barber_rows(barber_stats, BARBER_TABLE_LIMIT)
+
+    def show_barber_rows(barber_stats: List[dict], limit: Optional[int]):
+        """Show the first `limit` barbers (all if None) in pooled rows, growing the pool if needed."""
+        count = len(barber_stats) if limit is None else min(limit, len(barber_stats))
+        while len(barber_row_pool) < count:
+            add_barber_row()
+        for i, (row, name_text, count_text, income_text) in enumerate(barber_row_pool):
+            if i < count:
+                b = barber_stats[i]
+                name_text.value = b["name"]
+                count_text.value = str(b["count"])
+                income_text.value = _format_money(b["income"])
+                row.visible = True
+            else:
+                row.visible = False
+        show_more_button.current.visible = count < len(barber_stats)
+
+    def show_all_barbers(e):
+        """Fetch the barbers beyond the top BARBER_TABLE_LIMIT off the UI thread."""
+        show_more_button.current.disabled = True
+        page.update()
+        page.run_thread(load_all_barbers_in_background, refresh_generation, *shown_range)
+    
+    def load_all_barbers_in_background(generation: int, start: date, end: date):
+        """List every barber of the shown range, unless a newer refresh replaced it."""
+        try:
+            barber_stats = _load_all_barber_stats(start, end)
+            if generation == refresh_generation:
+                show_barber_rows(barber_stats, None)
+        except Exception:
+            logger.exception("Error cargando el desempeño de barberos")
+            page.snack_bar = ft.SnackBar(
+                content=ft.Text("Error al cargar los barberos"),
+                bgcolor=AppTheme.TEXT_ERROR
+            )
+            page.snack_bar.open = True
+        finally:
+            show_more_button.current.disabled = False
+            page.update()
+
     def refresh_content():
         """Refresh the displayed statistics based on current mode and dates."""
-        nonlocal view_mode, selected_date, period_start, period_end
+        nonlocal view_mode, selected_date, period_start, period_end, refresh_generation, last_refresh_key
         
         if view_mode == "daily":
             start = end = selected_date
@@ -178,9 +364,56 @@ def create_reports_view(page: ft.Page) -> ft.Control:
             start = period_start
             end = period_end
         
-        # Update content
-        content_container.current.controls = build_stats_content(start, end, view_mode == "daily")
+        key = (view_mode, start, end)
+        if key == last_refresh_key:
+            return
+        last_refresh_key = key
+        
+        period_label = build_period_label(start, end, view_mode == "daily")
+        
+        # Query off the UI thread; the spinner (and new dates) show while it runs
+        refresh_generation += 1
+        loading_ring.current.visible = True
+        page.update()
+        page.run_thread(load_stats_in_background, refresh_generation, start, end, period_label)
+
+    def schedule_refresh():
+        """Show the new selection now and refresh the stats once changes settle."""
+        nonlocal refresh_timer
         page.update()
+        if refresh_timer:
+            refresh_timer.cancel()
+        # The timer only dispatches: refresh_content runs on the page's worker threads
+        refresh_timer = threading.Timer(REFRESH_DEBOUNCE_SECONDS, page.run_thread, args=(refresh_content,))
+        refresh_timer.daemon = True
+        refresh_timer.start()
+
+    def load_stats_in_background(generation: int, start: date, end: date, period_label: str):
+        """Fetch statistics in a worker thread and apply them if still current."""
+        nonlocal last_refresh_key, shown_range
+        try:
+            stats, barber_stats = get_stats(start, end)
+            # A newer refresh was started meanwhile: its result wins
+            if generation != refresh_generation:
+                return
+            update_stats_content(stats, barber_stats, period_label)
+            shown_range = (start, end)
+        except Exception:
+            logger.exception("Error cargando las estadísticas de reportes")
+            if generation != refresh_generation:
+                return
+            # Selecting the same range again retries instead of being a no-op
+            last_refresh_key = None
+            page.snack_bar = ft.SnackBar(
+                content=ft.Text("Error al cargar las estadísticas"),
+                bgcolor=AppTheme.TEXT_ERROR
+            )
+            page.snack_bar.open = True
+        finally:
+            # The newest refresh owns the spinner
+            if generation == refresh_generation:
+                loading_ring.current.visible = False
+                page.update()
 
     def on_date_change(e):
         """Handle single date picker change."""
@@ -188,7 +421,7 @@ def create_reports_view(page: ft.Page) -> ft.Control:
         if e.control.value:
             selected_date = e.control.value.date() if isinstance(e.control.value, datetime) else e.control.value
             date_display.current.value = selected_date.strftime("%d/%m/%Y")
-            refresh_content()
+            schedule_refresh()
 
     def on_period_start_change(e):
         """Handle period start date change."""
@@ -196,7 +429,7 @@ def create_reports_view(page: ft.Page) -> ft.Control:
         if e.control.value:
             period_start = e.control.value.date() if isinstance(e.control.value, datetime) else e.control.value
             period_start_text.current.value = period_start.strftime("%d/%m/%Y")
-            refresh_content()
+            schedule_refresh()
 
     def on_period_end_change(e):
         """Handle period end date change."""
@@ -204,14 +437,14 @@ def create_reports_view(page: ft.Page) -> ft.Control:
         if e.control.value:
             period_end = e.control.value.date() if isinstance(e.control.value, datetime) else e.control.value
             period_end_text.current.value = period_end.strftime("%d/%m/%Y")
-            refresh_content()
+            schedule_refresh()
 
     def on_mode_switch(e):
         """Toggle between daily and period view."""
         nonlocal view_mode
         view_mode = "period" if e.control.value else "daily"
         period_row.current.visible = (view_mode == "period")
-        refresh_content()
+        schedule_refresh()
 
     def open_date_picker(e):
         """Open the date picker dialog."""
@@ -228,33 +461,21 @@ def create_reports_view(page: ft.Page) -> ft.Control:
         period_end_picker.open = True
         page.update()
 
-    # Date pickers
-    date_picker = ft.DatePicker(
-        first_date=date(2020, 1, 1),
-        last_date=date.today(),
-        on_change=on_date_change,
-    )
-    
-    period_start_picker = ft.DatePicker(
-        first_date=date(2020, 1, 1),
-        last_date=date.today(),
-        on_change=on_period_start_change,
-    )
-    
-    period_end_picker = ft.DatePicker(
-        first_date=date(2020, 1, 1),
-        last_date=date.today(),
-        on_change=on_period_end_change,
-    )
-    
-    # Add pickers to page overlay
-    page.overlay.extend([date_picker, period_start_picker, period_end_picker])
+    # Date pickers (shared by every visit to this view on the page)
+    date_picker, period_start_picker, period_end_picker = _get_date_pickers(page)
+    date_picker.value = selected_date
+    date_picker.on_change = on_date_change
+    period_start_picker.value = period_start
+    period_start_picker.on_change = on_period_start_change
+    period_end_picker.value = period_end
+    period_end_picker.on_change = on_period_end_change
     
     # Header with date selector
     header_row = ft.Row(
         controls=[
 
             ft.Text("📊 Reportes", size=24, weight=ft.FontWeight.BOLD),
+            ft.ProgressRing(width=20, height=20, visible=False, ref=loading_ring),
             ft.Container(expand=True),
             ft.Text("Ver periodo:", size=13, color=AppTheme.TEXT_SECONDARY),
             ft.Switch(
@@ -306,7 +527,14 @@ def create_reports_view(page: ft.Page) -> ft.Control:
     )
     
     # Initial content
-    initial_content = build_stats_content(selected_date, selected_date, True)
+    initial_content = build_stats_layout()
+    # First render loads synchronously: nothing is on screen to keep responsive yet
+    last_refresh_key = ("daily", selected_date, selected_date)
+    shown_range = (selected_date, selected_date)
+    update_stats_content(
+        *get_stats(selected_date, selected_date),
+        build_period_label(selected_date, selected_date, True)
+    )
     
     return ft.Column(
         controls=[
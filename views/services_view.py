@@ -3,7 +3,9 @@ Services view for Barber Manager.
 Service management with CRUD operations.
 """
 import flet as ft
-from typing import Optional, List
+from bisect import bisect
+from operator import itemgetter
+from typing import Dict, Optional, List, Tuple
 
 from database import get_db
 from models.base import Service
@@ -11,46 +13,111 @@ from services.service_service import ServiceService
 from utils.theme import AppTheme
 
 
+# Service cards built per batch; the next batch is added when scrolling nears the end
+SERVICE_LIST_BATCH_SIZE = 20
+# Distance (px) from the end of the list that triggers the next batch
+SERVICE_LIST_LOAD_THRESHOLD = 300
+
+_format_price = "${:.2f}".format
+
+# Service card styling that does not depend on the service, resolved once
+_CARD_BGCOLOR = ft.Colors.with_opacity(0.05, ft.Colors.WHITE)
+_STATUS_BADGE_PADDING = ft.padding.symmetric(horizontal=8, vertical=2)
+
+# The dialogs of the last services view, stored on the page so a rebuilt view
+# can remove them from the overlay (by identity) instead of piling them up
+_DIALOGS_ATTR = "_services_dialogs"
+
+
+def _service_as_dict(service: Service) -> dict:
+    """Same shape as ServiceService.get_all_services_lite rows."""
+    return {
+        "id": service.id,
+        "name": service.name,
+        "duration": service.duration,
+        "price": service.price,
+        "is_active": service.is_active,
+    }
+
+
 def create_services_view(page: ft.Page) -> ft.Control:
     """
     Create the service management view.
     Features list and CRUD operations.
     """
     services: List[dict] = []
+    rendered_count = 0
+    # service id -> (content hash, card): saving a service without changing it keeps its card
+    card_cache: Dict[int, Tuple[int, ft.Control]] = {}
     
     # Refs
     service_list_ref = ft.Ref[ft.Container]()
+    service_list_view = ft.Ref[ft.ListView]()
     
     def load_services():
         """Load services from database as dicts to avoid detached instance errors."""
         nonlocal services
-        services = []
         with get_db() as db:
-            db_services = ServiceService.get_all_services(db, active_only=False)
-            for s in db_services:
-                services.append({
-                    "id": s.id,
-                    "name": s.name,
-                    "duration": s.duration,
-                    "price": s.price,
-                    "is_active": s.is_active
-                })
+            services = ServiceService.get_all_services_lite(db, active_only=False)
     
-    def refresh():
-        """Refresh the view."""
-        load_services()
-        service_list_ref.current.content = build_service_list()
-        page.update()
+    def apply_service_change(service_id: int, service: Optional[dict]):
+        """
+        Update the list after one service was created, edited (service set)
+        or deleted (service None), touching only that service's card.
+        """
+        nonlocal rendered_count
+        was_empty = not services
+        
+        index = next((i for i, s in enumerate(services) if s["id"] == service_id), None)
+        if index is not None:
+            services.pop(index)
+            if index < rendered_count:
+                service_list_view.current.controls.pop(index)
+                rendered_count -= 1
+        
+        if service is None:
+            card_cache.pop(service_id, None)
+        else:
+            # Keep the list ordered by name; cards past the rendered batch come with a later one
+            position = bisect(services, service["name"], key=itemgetter("name"))
+            all_rendered = rendered_count == len(services)
+            services.insert(position, service)
+            if not was_empty and (position < rendered_count or all_rendered):
+                service_list_view.current.controls.insert(position, get_service_card(service))
+                rendered_count += 1
+        
+        # Switching between the empty state and the list needs the full build
+        if was_empty or not services:
+            service_list_ref.current.content = build_service_list()
+    
+    def get_service_card(service: dict) -> ft.Control:
+        """Return the cached card for a service, rebuilding it only if its data changed."""
+        content_hash = hash((service["name"], service["duration"], service["price"], service["is_active"]))
+        cached = card_cache.get(service["id"])
+        if cached and cached[0] == content_hash:
+            return cached[1]
+        card = build_service_card(service)
+        card_cache[service["id"]] = (content_hash, card)
+        return card
     
     def build_service_card(service: dict) -> ft.Control:
         """Build a single service card."""
+        # Resolved once per card: this runs for every card in a batch
+        is_active = service["is_active"]
+        primary = AppTheme.PRIMARY
+        colors = ft.Colors
+        icons = ft.Icons
+        muted_icon_color = colors.GREY_500
+        muted_text_color = colors.GREY_400
+        price_text = _format_price(service["price"]) if service["price"] > 0 else "Sin precio"
+        duration_text = f"{service['duration']} minutos"
         return ft.Container(
             content=ft.Row(
                 controls=[
                     ft.Container(
-                        content=ft.Icon(ft.Icons.CONTENT_CUT, color=ft.Colors.WHITE, size=24),
+                        content=ft.Icon(icons.CONTENT_CUT, color=colors.WHITE, size=24),
                         width=50, height=50,
-                        bgcolor=ft.Colors.PURPLE_700 if service["is_active"] else ft.Colors.GREY_700,
+                        bgcolor=colors.PURPLE_700 if is_active else colors.GREY_700,
                         border_radius=10, alignment=ft.Alignment(0, 0)
                     ),
                     ft.Column(
@@ -60,11 +127,11 @@ def create_services_view(page: ft.Page) -> ft.Control:
                                     ft.Text(service["name"], size=16, weight=ft.FontWeight.BOLD),
                                     ft.Container(
                                         content=ft.Text(
-                                            "Activo" if service["is_active"] else "Inactivo",
-                                            size=10, color=ft.Colors.WHITE
+                                            "Activo" if is_active else "Inactivo",
+                                            size=10, color=colors.WHITE
                                         ),
-                                        bgcolor=AppTheme.PRIMARY if service["is_active"] else ft.Colors.GREY_600,
-                                        padding=ft.padding.symmetric(horizontal=8, vertical=2),
+                                        bgcolor=primary if is_active else colors.GREY_600,
+                                        padding=_STATUS_BADGE_PADDING,
                                         border_radius=10
                                     )
                                 ],
@@ -72,14 +139,11 @@ def create_services_view(page: ft.Page) -> ft.Control:
                             ),
                             ft.Row(
                                 controls=[
-                                    ft.Icon(ft.Icons.TIMER, size=14, color=ft.Colors.GREY_500),
-                                    ft.Text(f"{service['duration']} minutos", size=12, color=ft.Colors.GREY_400),
+                                    ft.Icon(icons.TIMER, size=14, color=muted_icon_color),
+                                    ft.Text(duration_text, size=12, color=muted_text_color),
                                     ft.Container(width=15),
-                                    ft.Icon(ft.Icons.ATTACH_MONEY, size=14, color=ft.Colors.GREY_500),
-                                    ft.Text(
-                                        f"${service['price']:.2f}" if service["price"] > 0 else "Sin precio",
-                                        size=12, color=ft.Colors.GREY_400
-                                    )
+                                    ft.Icon(icons.ATTACH_MONEY, size=14, color=muted_icon_color),
+                                    ft.Text(price_text, size=12, color=muted_text_color)
                                 ],
                                 spacing=5
                             )
@@ -88,9 +152,9 @@ def create_services_view(page: ft.Page) -> ft.Control:
                     ),
                     ft.Row(
                         controls=[
-                            ft.IconButton(icon=ft.Icons.EDIT, icon_color=AppTheme.PRIMARY, tooltip="Editar",
+                            ft.IconButton(icon=icons.EDIT, icon_color=primary, tooltip="Editar",
                                          on_click=lambda e, s=service: show_service_dialog(s)),
-                            ft.IconButton(icon=ft.Icons.DELETE, icon_color=AppTheme.TEXT_ERROR, tooltip="Eliminar",
+                            ft.IconButton(icon=icons.DELETE, icon_color=AppTheme.TEXT_ERROR, tooltip="Eliminar",
                                          on_click=lambda e, s=service: confirm_delete(s))
                         ],
                         spacing=0
@@ -98,7 +162,7 @@ def create_services_view(page: ft.Page) -> ft.Control:
                 ],
                 alignment=ft.MainAxisAlignment.START
             ),
-            padding=15, border_radius=10, bgcolor=ft.Colors.with_opacity(0.05, ft.Colors.WHITE)
+            padding=15, border_radius=10, bgcolor=_CARD_BGCOLOR
         )
     
     def build_service_list() -> ft.Control:
@@ -115,119 +179,171 @@ def create_services_view(page: ft.Page) -> ft.Control:
                 alignment=ft.Alignment(0, 0), expand=True
             )
         
-        cards = [build_service_card(service) for service in services]
-        return ft.ListView(controls=cards, spacing=10, expand=True)
+        nonlocal rendered_count
+        rendered_count = min(SERVICE_LIST_BATCH_SIZE, len(services))
+        cards = [get_service_card(service) for service in services[:rendered_count]]
+        return ft.ListView(
+            controls=cards, spacing=10, expand=True, on_scroll=on_list_scroll, ref=service_list_view
+        )
+    
+    def on_list_scroll(e: ft.OnScrollEvent):
+        """Build the next batch of cards when the user scrolls close to the end."""
+        nonlocal rendered_count
+        if rendered_count >= len(services):
+            return
+        if e.pixels < e.max_scroll_extent - SERVICE_LIST_LOAD_THRESHOLD:
+            return
+        
+        next_count = min(rendered_count + SERVICE_LIST_BATCH_SIZE, len(services))
+        list_view = e.control
+        list_view.controls.extend(get_service_card(s) for s in services[rendered_count:next_count])
+        rendered_count = next_count
+        list_view.update()
+    
+    # Dialogs are built once per view and reused; opening one only rewrites its fields
+    editing_service: Optional[dict] = None
+    deleting_service: Optional[dict] = None
+    
+    name_field_ref = ft.Ref[ft.TextField]()
+    duration_field_ref = ft.Ref[ft.TextField]()
+    price_field_ref = ft.Ref[ft.TextField]()
+    active_switch_ref = ft.Ref[ft.Switch]()
+    error_text_ref = ft.Ref[ft.Text]()
+    service_dialog_title_ref = ft.Ref[ft.Text]()
+    delete_message_ref = ft.Ref[ft.Text]()
+    
+    def open_dialog(dialog: ft.AlertDialog):
+        """Open one of this view's dialogs, adding it to the overlay only if missing."""
+        if dialog not in page.overlay:
+            page.overlay.append(dialog)
+        dialog.open = True
+        page.update()
+    
+    def close_dialog(dialog: ft.AlertDialog):
+        """Close a dialog, keeping it in the overlay for reuse."""
+        dialog.open = False
+        page.update()
     
     def show_service_dialog(service: Optional[dict]):
         """Show service form dialog."""
-        is_edit = service is not None
-        
-        name_field = ft.TextField(
-            label="Nombre del servicio", value=service["name"] if service else "", autofocus=True,
-            border_color=AppTheme.BORDER_DEFAULT, focused_border_color=AppTheme.BORDER_FOCUS
-        )
-        duration_field = ft.TextField(
-            label="Duración (minutos)", value=str(service["duration"]) if service else "30", keyboard_type=ft.KeyboardType.NUMBER,
-            border_color=AppTheme.BORDER_DEFAULT, focused_border_color=AppTheme.BORDER_FOCUS
-        )
-        price_field = ft.TextField(
-            label="Precio", value=str(service["price"]) if service else "0.0", keyboard_type=ft.KeyboardType.NUMBER,
-            border_color=AppTheme.BORDER_DEFAULT, focused_border_color=AppTheme.BORDER_FOCUS
-        )
-        active_switch = ft.Switch(label="Servicio activo", value=service["is_active"] if service else True, active_color=AppTheme.PRIMARY)
-        error_text = ft.Text("", color=AppTheme.TEXT_ERROR, visible=False)
-        
-        def close_dialog(e):
-            dialog.open = False
-            page.update()
+        nonlocal editing_service
+        editing_service = service
         
-        def save_service(e):
-            try:
-                duration = int(duration_field.value)
-                price = float(price_field.value)
-            except ValueError:
-                error_text.value = "Duración y precio deben ser números válidos"
-                error_text.visible = True
-                page.update()
-                return
-            
-            with get_db() as db:
-                if is_edit:
-                    result, error = ServiceService.update_service(
-                        db, service_id=service["id"], name=name_field.value,
-                        duration=duration, price=price, is_active=active_switch.value
-                    )
-                else:
-                    result, error = ServiceService.create_service(
-                        db, name=name_field.value, duration=duration,
-                        price=price, is_active=active_switch.value
-                    )
-                
-                if error:
-                    error_text.value = error
-                    error_text.visible = True
-                    page.update()
-                    return
-            
-            dialog.open = False
-            refresh()
+        service_dialog_title_ref.current.value = "Editar Servicio" if service else "Nuevo Servicio"
+        name_field_ref.current.value = service["name"] if service else ""
+        duration_field_ref.current.value = str(service["duration"]) if service else "30"
+        price_field_ref.current.value = str(service["price"]) if service else "0.0"
+        active_switch_ref.current.value = service["is_active"] if service else True
+        error_text_ref.current.visible = False
+        open_dialog(service_dialog)
+    
+    def show_service_error(message: str):
+        """Show a validation error inside the service dialog."""
+        error_text_ref.current.value = message
+        error_text_ref.current.visible = True
+        page.update()
+    
+    def save_service(e):
+        service = editing_service
+        try:
+            duration = int(duration_field_ref.current.value)
+            price = float(price_field_ref.current.value)
+        except ValueError:
+            show_service_error("Duración y precio deben ser números válidos")
+            return
         
-        dialog = ft.AlertDialog(
-            modal=True,
-            title=ft.Text("Editar Servicio" if is_edit else "Nuevo Servicio"),
-            content=ft.Column(
-                controls=[name_field, duration_field, price_field, active_switch, error_text],
-                tight=True, spacing=15, width=350
-            ),
-            actions=[
-                ft.TextButton(content=ft.Text("Cancelar"), on_click=close_dialog),
-                ft.ElevatedButton(
-                    content=ft.Text("Guardar", color=AppTheme.BTN_TEXT),
-                    on_click=save_service,
-                    style=ft.ButtonStyle(bgcolor=AppTheme.PRIMARY, color=AppTheme.BTN_TEXT)
+        name = name_field_ref.current.value
+        is_active = active_switch_ref.current.value
+        with get_db() as db:
+            if service:
+                result, error = ServiceService.update_service(
+                    db, service_id=service["id"], name=name,
+                    duration=duration, price=price, is_active=is_active
                 )
-            ]
-        )
+            else:
+                result, error = ServiceService.create_service(
+                    db, name=name, duration=duration,
+                    price=price, is_active=is_active
+                )
+            
+            if error:
+                show_service_error(error)
+                return
+            saved = _service_as_dict(result)
         
-        page.overlay.clear()
-        page.overlay.append(dialog)
-        dialog.open = True
-        page.update()
+        apply_service_change(saved["id"], saved)
+        close_dialog(service_dialog)
     
     def confirm_delete(service: dict):
         """Show delete confirmation dialog."""
-        def close_dialog(e):
-            dialog.open = False
-            page.update()
-        
-        def delete_service(e):
-            with get_db() as db:
-                success, error = ServiceService.delete_service(db, service["id"])
-                if error:
-                    page.snack_bar = ft.SnackBar(content=ft.Text(error), bgcolor=ft.Colors.RED_700)
-                    page.snack_bar.open = True
-            
-            dialog.open = False
-            refresh()
-        
-        dialog = ft.AlertDialog(
-            modal=True,
-            title=ft.Row(controls=[ft.Icon(ft.Icons.WARNING, color=ft.Colors.ORANGE_400), ft.Text("Confirmar Eliminación")]),
-            content=ft.Text(f"¿Estás seguro que deseas eliminar el servicio '{service['name']}'?"),
-            actions=[
-                ft.TextButton(content=ft.Text("Cancelar"), on_click=close_dialog),
-                ft.ElevatedButton(
-                    content=ft.Text("Eliminar"),
-                    on_click=delete_service,
-                    style=ft.ButtonStyle(bgcolor=ft.Colors.RED_700, color=ft.Colors.WHITE)
-                )
-            ]
-        )
+        nonlocal deleting_service
+        deleting_service = service
+        delete_message_ref.current.value = f"¿Estás seguro que deseas eliminar el servicio '{service['name']}'?"
+        open_dialog(delete_dialog)
+    
+    def delete_service(e):
+        service = deleting_service
+        with get_db() as db:
+            success, error = ServiceService.delete_service(db, service["id"])
+            if error:
+                page.snack_bar = ft.SnackBar(content=ft.Text(error), bgcolor=ft.Colors.RED_700)
+                page.snack_bar.open = True
         
-        page.overlay.clear()
-        page.overlay.append(dialog)
-        dialog.open = True
-        page.update()
+        if not error:
+            apply_service_change(service["id"], None)
+        close_dialog(delete_dialog)
+    
+    service_dialog = ft.AlertDialog(
+        modal=True,
+        title=ft.Text("Nuevo Servicio", ref=service_dialog_title_ref),
+        content=ft.Column(
+            controls=[
+                ft.TextField(
+                    label="Nombre del servicio", autofocus=True, ref=name_field_ref,
+                    border_color=AppTheme.BORDER_DEFAULT, focused_border_color=AppTheme.BORDER_FOCUS
+                ),
+                ft.TextField(
+                    label="Duración (minutos)", keyboard_type=ft.KeyboardType.NUMBER, ref=duration_field_ref,
+                    border_color=AppTheme.BORDER_DEFAULT, focused_border_color=AppTheme.BORDER_FOCUS
+                ),
+                ft.TextField(
+                    label="Precio", keyboard_type=ft.KeyboardType.NUMBER, ref=price_field_ref,
+                    border_color=AppTheme.BORDER_DEFAULT, focused_border_color=AppTheme.BORDER_FOCUS
+                ),
+                ft.Switch(label="Servicio activo", active_color=AppTheme.PRIMARY, ref=active_switch_ref),
+                ft.Text("", color=AppTheme.TEXT_ERROR, visible=False, ref=error_text_ref)
+            ],
+            tight=True, spacing=15, width=350
+        ),
+        actions=[
+            ft.TextButton(content=ft.Text("Cancelar"), on_click=lambda e: close_dialog(service_dialog)),
+            ft.ElevatedButton(
+                content=ft.Text("Guardar", color=AppTheme.BTN_TEXT),
+                on_click=save_service,
+                style=ft.ButtonStyle(bgcolor=AppTheme.PRIMARY, color=AppTheme.BTN_TEXT)
+            )
+        ]
+    )
+    
+    delete_dialog = ft.AlertDialog(
+        modal=True,
+        title=ft.Row(controls=[ft.Icon(ft.Icons.WARNING, color=ft.Colors.ORANGE_400), ft.Text("Confirmar Eliminación")]),
+        content=ft.Text("", ref=delete_message_ref),
+        actions=[
+            ft.TextButton(content=ft.Text("Cancelar"), on_click=lambda e: close_dialog(delete_dialog)),
+            ft.ElevatedButton(
+                content=ft.Text("Eliminar"),
+                on_click=delete_service,
+                style=ft.ButtonStyle(bgcolor=ft.Colors.RED_700, color=ft.Colors.WHITE)
+            )
+        ]
+    )
+    
+    # Drop the previous view's dialogs; this view's are added on first open
+    for stale_dialog in getattr(page, _DIALOGS_ATTR, ()):
+        if stale_dialog in page.overlay:
+            page.overlay.remove(stale_dialog)
+    setattr(page, _DIALOGS_ATTR, [service_dialog, delete_dialog])
     
     # Initial load
     load_services()
@@ -3,53 +3,214 @@ Settings view for Barber Manager.
 Configuration and preferences.
 """
 import flet as ft
+import asyncio
+import time
+from contextlib import contextmanager
+from functools import lru_cache, partial
+from typing import Callable, List, Optional, Tuple
 
-from database import get_db, reset_db
+from config import logger
+from database import get_db, get_read_db, reset_database
+from services.appointment_service import AppointmentService
+from services.barber_service import BarberService
+from services.service_service import ServiceService
 from services.settings_service import SettingsService
+from utils.report_cache import report_cache
 from utils.theme import AppTheme
 
 
+# (min, max) hour offered by the opening and closing hour sliders
+_START_HOUR_RANGE = (6, 15)
+_END_HOUR_RANGE = (14, 23)
+
+
+def _clamp_hour(hour: int, hour_range: Tuple[int, int]) -> int:
+    """Fit a stored hour into a slider's range (older data may fall outside it)."""
+    low, high = hour_range
+    return min(max(hour, low), high)
+
+
+def _hour_slider(hour: int, hour_range: Tuple[int, int], on_change_end, ref: ft.Ref) -> ft.Slider:
+    """One-hour-step slider: a single control instead of a dropdown with an option per hour."""
+    low, high = hour_range
+    return ft.Slider(
+        min=low,
+        max=high,
+        divisions=high - low,
+        value=_clamp_hour(hour, hour_range),
+        label="{value}:00",
+        active_color=AppTheme.PRIMARY,
+        on_change_end=on_change_end,
+        expand=True,
+        ref=ref
+    )
+
+
+# Section background, resolved once instead of per section per visit
+_SECTION_BGCOLOR = ft.Colors.with_opacity(0.05, ft.Colors.WHITE)
+
+# Per-page state is stored on the page itself, so it is freed with the page:
+# - the dialogs the last settings view added to the overlay, removed by identity
+#   when the view is rebuilt so visits don't pile up dialogs
+# - the settings view and the function that refreshes its dynamic values;
+#   later visits reuse it instead of rebuilding
+_DIALOGS_ATTR = "_settings_dialogs"
+_VIEW_ATTR = "_settings_view"
+
+# Revisits to the settings view within this window reuse the loaded business hours
+BUSINESS_HOURS_CACHE_TTL_SECONDS = 5
+
+
+@lru_cache(maxsize=1)
+def _load_business_hours(ts_bucket: int) -> Tuple[int, int]:
+    """
+    Load (opening hour, closing hour). Cached per TTL bucket;
+    saving hours or resetting the database clears the cache.
+    """
+    with get_read_db() as db:
+        return SettingsService.get_business_hours(db)
+
+
+def _get_business_hours() -> Tuple[int, int]:
+    """Return cached business hours, reloading when stale."""
+    return _load_business_hours(int(time.time() // BUSINESS_HOURS_CACHE_TTL_SECONDS))
+
+
+@contextmanager
+def _batched(page: ft.Page):
+    """Send the control changes made inside the block with a single page.update(), even if it raises."""
+    try:
+        yield
+    finally:
+        page.update()
+
+
+def _make_label_row(label: str, *controls: ft.Control) -> ft.Row:
+    """Build a form row: a fixed-width label followed by its controls."""
+    return ft.Row(controls=[ft.Text(label, width=150), *controls])
+
+
+def _build_section(title: str, subtitle: str, controls: List[ft.Control]) -> ft.Control:
+    """Build a settings section."""
+    return ft.Container(
+        content=ft.Column(
+            controls=[
+                ft.Text(title, size=18, weight=ft.FontWeight.W_500),
+                ft.Text(subtitle, size=12, color=AppTheme.TEXT_SECONDARY),
+                ft.Container(height=10),
+                *controls
+            ]
+        ),
+        padding=20,
+        border_radius=10,
+        bgcolor=_SECTION_BGCOLOR
+    )
+
+
+def _google_calendar_controls() -> List[ft.Control]:
+    """Controls of the Google Calendar section (static: not connected yet)."""
+    return [
+        ft.Row(controls=[ft.Icon(ft.Icons.CLOUD_OFF, color=ft.Colors.ORANGE_400), ft.Text("No conectado", color=ft.Colors.ORANGE_400)], spacing=10),
+        ft.ElevatedButton(
+            content=ft.Text("Conectar Google Calendar"),
+            icon=ft.Icons.LINK,
+            disabled=True,
+            tooltip="Próximamente"
+        ),
+        ft.Text("La integración con Google Calendar estará disponible próximamente", size=12, color=AppTheme.TEXT_SECONDARY, italic=True)
+    ]
+
+
+def _about_controls() -> List[ft.Control]:
+    """Controls of the About section (static)."""
+    return [
+        ft.Text("Barber Manager v1.0.0", size=14),
+        ft.Text("Aplicación de gestión para barberías", size=12, color=AppTheme.TEXT_SECONDARY),
+        ft.Text("Desarrollado con Flet + SQLAlchemy", size=12, color=AppTheme.TEXT_SECONDARY)
+    ]
+
+
+# Sections in display order: (title, subtitle, controls key). The view maps each
+# key to a builder; static sections use the module-level builders above.
+_SECTIONS = (
+    ("Horario de Trabajo", "Configura el horario de atención", "hours"),
+    ("Google Calendar", "Sincronización con Google Calendar", "google_calendar"),
+    ("Base de Datos", "Gestión de datos", "database"),
+    ("Acerca de", "Información de la aplicación", "about"),
+)
+
+
+def _close_dialog(page: ft.Page, dialog: ft.AlertDialog, e=None):
+    """Close a dialog, keeping it in the overlay for reuse. Bound with partial as on_click."""
+    with _batched(page):
+        dialog.open = False
+
+
+async def create_settings_view_async(page: ft.Page) -> ft.Control:
+    """
+    Async entry point for route handlers running on the event loop.
+    Loads the business hours in a worker thread first, so building the view
+    only reads the warm cache and never blocks the loop on the database.
+    """
+    await asyncio.to_thread(_get_business_hours)
+    return create_settings_view(page)
+
+
 def create_settings_view(page: ft.Page) -> ft.Control:
     """
     Create the settings/configuration view.
     Allows editing of business hours and other preferences.
+    The view is built once per page; later calls refresh and return it.
     """
+    cached: Optional[Tuple[ft.Control, Callable[[], None]]] = getattr(page, _VIEW_ATTR, None)
+    if cached:
+        view, refresh = cached
+        refresh()
+        return view
     
     # Load current settings
-    start_hour = 12
-    end_hour = 20
-    with get_db() as db:
-        start_hour, end_hour = SettingsService.get_business_hours(db)
-    
-    # Refs for dropdowns
-    start_dropdown_ref = ft.Ref[ft.Dropdown]()
-    end_dropdown_ref = ft.Ref[ft.Dropdown]()
-    
-    def build_section(title: str, subtitle: str, controls: list) -> ft.Control:
-        """Build a settings section."""
-        return ft.Container(
-            content=ft.Column(
-                controls=[
-                    ft.Text(title, size=18, weight=ft.FontWeight.W_500),
-                    ft.Text(subtitle, size=12, color=AppTheme.TEXT_SECONDARY),
-                    ft.Container(height=10),
-                    *controls
-                ]
-            ),
-            padding=20,
-            border_radius=10,
-            bgcolor=ft.Colors.with_opacity(0.05, ft.Colors.WHITE)
-        )
+    start_hour, end_hour = _get_business_hours()
+    
+    # Refs for the hour sliders and the hour shown next to each
+    start_slider_ref = ft.Ref[ft.Slider]()
+    end_slider_ref = ft.Ref[ft.Slider]()
+    start_hour_text = ft.Ref[ft.Text]()
+    end_hour_text = ft.Ref[ft.Text]()
+    
+    def show_saved_hours():
+        """Select the saved business hours, dropping unsaved slider changes."""
+        start, end = _get_business_hours()
+        start_slider_ref.current.value = _clamp_hour(start, _START_HOUR_RANGE)
+        end_slider_ref.current.value = _clamp_hour(end, _END_HOUR_RANGE)
+        show_selected_hours()
+    
+    def show_selected_hours():
+        """Show the sliders' hours as HH:00 next to them."""
+        start_hour_text.current.value = f"{int(start_slider_ref.current.value):02d}:00"
+        end_hour_text.current.value = f"{int(end_slider_ref.current.value):02d}:00"
+    
+    def on_hour_change_end(e):
+        """Update the displayed hours once the user releases a slider."""
+        with _batched(page):
+            show_selected_hours()
+    
+    def open_dialog(dialog: ft.AlertDialog):
+        """Open one of this view's dialogs, adding it to the overlay only if missing."""
+        with _batched(page):
+            # Other views clear the overlay when they open their own dialogs
+            if dialog not in page.overlay:
+                page.overlay.append(dialog)
+            dialog.open = True
     
     def save_business_hours(e):
         """Save business hours to database."""
         try:
-            if not start_dropdown_ref.current or not end_dropdown_ref.current:
+            if not start_slider_ref.current or not end_slider_ref.current:
                 show_error("Error: No se pudieron obtener los valores")
                 return
             
-            start = int(start_dropdown_ref.current.value.split(":")[0])
-            end = int(end_dropdown_ref.current.value.split(":")[0])
+            start = int(start_slider_ref.current.value)
+            end = int(end_slider_ref.current.value)
             
             if end <= start:
                 show_error("La hora de cierre debe ser mayor a la de apertura")
@@ -57,169 +218,181 @@ def create_settings_view(page: ft.Page) -> ft.Control:
             
             with get_db() as db:
                 SettingsService.set_business_hours(db, start, end)
+            _load_business_hours.cache_clear()
             
-            # Show success dialog
-            def close_success(e):
-                success_dialog.open = False
-                page.update()
-            
-            success_dialog = ft.AlertDialog(
-                modal=True,
-                title=ft.Row(
-                    controls=[
-                        ft.Icon(ft.Icons.CHECK_CIRCLE, color=AppTheme.PRIMARY, size=30),
-                        ft.Text("¡Horario Guardado!")
-                    ],
-                    spacing=10
-                ),
-                content=ft.Text(
-                    f"El horario de atención se ha actualizado:\n"
-                    f"Apertura: {start:02d}:00\n"
-                    f"Cierre: {end:02d}:00"
-                ),
-                actions=[
-                    ft.ElevatedButton(
-                        content=ft.Text("Aceptar", color=AppTheme.BTN_TEXT),
-                        on_click=close_success,
-                        style=ft.ButtonStyle(bgcolor=AppTheme.PRIMARY, color=AppTheme.BTN_TEXT)
-                    )
-                ]
+            success_text_ref.current.value = (
+                f"El horario de atención se ha actualizado:\n"
+                f"Apertura: {start:02d}:00\n"
+                f"Cierre: {end:02d}:00"
             )
-            
-            page.overlay.clear()
-            page.overlay.append(success_dialog)
-            success_dialog.open = True
-            page.update()
+            open_dialog(success_dialog)
             
         except Exception as ex:
             show_error(f"Error: {ex}")
     
     def show_error(message: str):
         """Show error message."""
-        page.snack_bar = ft.SnackBar(
-            content=ft.Text(message),
-            bgcolor=AppTheme.TEXT_ERROR
-        )
-        page.snack_bar.open = True
-        page.update()
+        with _batched(page):
+            page.snack_bar = ft.SnackBar(
+                content=ft.Text(message),
+                bgcolor=AppTheme.TEXT_ERROR
+            )
+            page.snack_bar.open = True
     
     def confirm_reset_db(e):
         """Show confirmation dialog for database reset."""
-        def close_dialog(e):
-            dialog.open = False
-            page.update()
+        open_dialog(reset_dialog)
+    
+    def set_reset_running(running: bool):
+        """Show the reset progress and lock the confirm button while it runs."""
+        reset_progress_ref.current.visible = running
+        # Cancelar stays enabled: it only hides the dialog, the reset still completes
+        reset_dialog.actions[1].disabled = running
+    
+    def do_reset(e):
+        """Start the database reset in a worker thread; the dialog shows progress meanwhile."""
+        with _batched(page):
+            set_reset_running(True)
+        page.run_thread(reset_in_background)
+    
+    def reset_in_background():
+        """Drop and recreate the database off the UI thread, then go back to the agenda."""
+        try:
+            reset_database()
+        except Exception as ex:
+            logger.exception("Error reiniciando la base de datos")
+            set_reset_running(False)
+            reset_dialog.open = False
+            show_error(f"Error: {ex}")
+            return
         
-        def do_reset(e):
-            reset_db()
-            dialog.open = False
-            page.snack_bar = ft.SnackBar(
-                content=ft.Text("Base de datos reiniciada correctamente"),
-                bgcolor=AppTheme.PRIMARY
+        _load_business_hours.cache_clear()
+        # Every table was recreated: invalidate the caches keyed on the data
+        # versions (appointment catalog, report stats) and the on-disk reports
+        AppointmentService.data_version += 1
+        BarberService.data_version += 1
+        ServiceService.data_version += 1
+        report_cache.clear()
+        # Seeded data replaces everything: the next visit builds a fresh view
+        setattr(page, _VIEW_ATTR, None)
+        reset_dialog.open = False
+        page.snack_bar = ft.SnackBar(
+            content=ft.Text("Base de datos reiniciada correctamente"),
+            bgcolor=AppTheme.PRIMARY
+        )
+        page.snack_bar.open = True
+        # The route change rebuilds the view and sends everything above in one update
+        page.go("/")
+    
+    # Dialogs: built once per view, only the success message changes per save
+    success_text_ref = ft.Ref[ft.Text]()
+    reset_progress_ref = ft.Ref[ft.ProgressBar]()
+    success_dialog = ft.AlertDialog(
+        modal=True,
+        title=ft.Row(
+            controls=[
+                ft.Icon(ft.Icons.CHECK_CIRCLE, color=AppTheme.PRIMARY, size=30),
+                ft.Text("¡Horario Guardado!")
+            ],
+            spacing=10
+        ),
+        content=ft.Text("", ref=success_text_ref),
+        actions=[
+            ft.ElevatedButton(
+                content=ft.Text("Aceptar", color=AppTheme.BTN_TEXT),
+                style=ft.ButtonStyle(bgcolor=AppTheme.PRIMARY, color=AppTheme.BTN_TEXT)
             )
-            page.snack_bar.open = True
-            page.push_route("/")
-        
-        dialog = ft.AlertDialog(
-            modal=True,
-            title=ft.Row(controls=[ft.Icon(ft.Icons.WARNING, color=AppTheme.TEXT_ERROR), ft.Text("¡Advertencia!")]),
-            content=ft.Text(
-                "Esta acción eliminará TODOS los datos (clientes, turnos, etc.) "
-                "y reiniciará la base de datos con los servicios por defecto.\n\n"
-                "¿Estás completamente seguro?"
+        ]
+    )
+    
+    reset_dialog = ft.AlertDialog(
+        modal=True,
+        title=ft.Row(controls=[ft.Icon(ft.Icons.WARNING, color=AppTheme.TEXT_ERROR), ft.Text("¡Advertencia!")]),
+        content=ft.Column(
+            controls=[
+                ft.Text(
+                    "Esta acción eliminará TODOS los datos (clientes, turnos, etc.) "
+                    "y reiniciará la base de datos con los servicios por defecto.\n\n"
+                    "¿Estás completamente seguro?"
+                ),
+                ft.ProgressBar(color=AppTheme.TEXT_ERROR, visible=False, ref=reset_progress_ref)
+            ],
+            tight=True, spacing=15
+        ),
+        actions=[
+            ft.TextButton("Cancelar"),
+            ft.ElevatedButton(
+                content=ft.Text("Sí, reiniciar", color=AppTheme.BTN_TEXT),
+                on_click=do_reset,
+                style=ft.ButtonStyle(bgcolor=AppTheme.TEXT_ERROR, color=AppTheme.BTN_TEXT)
+            )
+        ]
+    )
+    # Bound once both dialogs exist: partial needs the dialog object itself
+    success_dialog.actions[0].on_click = partial(_close_dialog, page, success_dialog)
+    reset_dialog.actions[0].on_click = partial(_close_dialog, page, reset_dialog)
+    for stale_dialog in getattr(page, _DIALOGS_ATTR, ()):
+        if stale_dialog in page.overlay:
+            page.overlay.remove(stale_dialog)
+    setattr(page, _DIALOGS_ATTR, [success_dialog, reset_dialog])
+    page.overlay.extend([success_dialog, reset_dialog])
+    
+    def build_hours_controls() -> List[ft.Control]:
+        """Controls of the business hours section, bound to this view's refs."""
+        return [
+            _make_label_row(
+                "Hora de apertura:",
+                _hour_slider(start_hour, _START_HOUR_RANGE, on_hour_change_end, start_slider_ref),
+                ft.Text(f"{_clamp_hour(start_hour, _START_HOUR_RANGE):02d}:00", width=60, ref=start_hour_text)
             ),
-            actions=[
-                ft.TextButton("Cancelar", on_click=close_dialog),
-                ft.ElevatedButton(
-                    content=ft.Text("Sí, reiniciar", color=AppTheme.BTN_TEXT),
-                    on_click=do_reset,
-                    style=ft.ButtonStyle(bgcolor=AppTheme.TEXT_ERROR, color=AppTheme.BTN_TEXT)
-                )
-            ]
-        )
-        
-        page.overlay.clear()
-        page.overlay.append(dialog)
-        dialog.open = True
-        page.update()
+            _make_label_row(
+                "Hora de cierre:",
+                _hour_slider(end_hour, _END_HOUR_RANGE, on_hour_change_end, end_slider_ref),
+                ft.Text(f"{_clamp_hour(end_hour, _END_HOUR_RANGE):02d}:00", width=60, ref=end_hour_text)
+            ),
+            ft.Container(height=10),
+            ft.ElevatedButton(
+                content=ft.Text("Guardar Horario", color=AppTheme.BTN_TEXT),
+                icon=ft.Icons.SAVE,
+                icon_color=AppTheme.BTN_TEXT,
+                on_click=save_business_hours,
+                style=ft.ButtonStyle(bgcolor=AppTheme.PRIMARY, color=AppTheme.BTN_TEXT)
+            )
+        ]
     
-    return ft.Column(
+    def build_database_controls() -> List[ft.Control]:
+        """Controls of the database section."""
+        return [
+            ft.ElevatedButton(
+                content=ft.Text("Reiniciar Base de Datos", color=AppTheme.BTN_TEXT),
+                icon=ft.Icons.REFRESH,
+                icon_color=AppTheme.BTN_TEXT,
+                on_click=confirm_reset_db,
+                style=ft.ButtonStyle(bgcolor=AppTheme.TEXT_ERROR, color=AppTheme.BTN_TEXT)
+            ),
+            ft.Text("⚠️ Esta acción eliminará todos los datos", size=12, color=AppTheme.TEXT_ERROR)
+        ]
+    
+    section_builders = {
+        "hours": build_hours_controls,
+        "google_calendar": _google_calendar_controls,
+        "database": build_database_controls,
+        "about": _about_controls,
+    }
+    sections: List[ft.Control] = []
+    for title, subtitle, key in _SECTIONS:
+        if sections:
+            sections.append(ft.Container(height=20))
+        sections.append(_build_section(title, subtitle, section_builders[key]()))
+    
+    view = ft.Column(
         controls=[
             ft.Text("⚙️ Configuración", size=28, weight=ft.FontWeight.BOLD),
             ft.Divider(height=20),
-            
-            build_section(
-                "Horario de Trabajo", "Configura el horario de atención",
-                [
-                    ft.Row(controls=[
-                        ft.Text("Hora de apertura:", width=150),
-                        ft.Dropdown(
-                            ref=start_dropdown_ref,
-                            value=f"{start_hour:02d}:00",
-                            options=[ft.dropdown.Option(f"{h:02d}:00") for h in range(6, 16)],
-                            width=120
-                        )
-                    ]),
-                    ft.Row(controls=[
-                        ft.Text("Hora de cierre:", width=150),
-                        ft.Dropdown(
-                            ref=end_dropdown_ref,
-                            value=f"{end_hour:02d}:00",
-                            options=[ft.dropdown.Option(f"{h:02d}:00") for h in range(14, 24)],
-                            width=120
-                        )
-                    ]),
-                    ft.Container(height=10),
-                    ft.ElevatedButton(
-                        content=ft.Text("Guardar Horario", color=AppTheme.BTN_TEXT),
-                        icon=ft.Icons.SAVE,
-                        icon_color=AppTheme.BTN_TEXT,
-                        on_click=save_business_hours,
-                        style=ft.ButtonStyle(bgcolor=AppTheme.PRIMARY, color=AppTheme.BTN_TEXT)
-                    )
-                ]
-            ),
-            ft.Container(height=20),
-            
-            build_section(
-                "Google Calendar", "Sincronización con Google Calendar",
-                [
-                    ft.Row(controls=[ft.Icon(ft.Icons.CLOUD_OFF, color=ft.Colors.ORANGE_400), ft.Text("No conectado", color=ft.Colors.ORANGE_400)], spacing=10),
-                    ft.ElevatedButton(
-                        content=ft.Text("Conectar Google Calendar"),
-                        icon=ft.Icons.LINK,
-                            
-                        disabled=True,
-                        tooltip="Próximamente"
-                    ),
-                    ft.Text("La integración con Google Calendar estará disponible próximamente", size=12, color=AppTheme.TEXT_SECONDARY, italic=True)
-                ]
-            ),
-            ft.Container(height=20),
-            
-            build_section(
-                "Base de Datos", "Gestión de datos",
-                [
-                    ft.ElevatedButton(
-                        content=ft.Text("Reiniciar Base de Datos", color=AppTheme.BTN_TEXT),
-                        icon=ft.Icons.REFRESH,
-                        icon_color=AppTheme.BTN_TEXT,
-                        on_click=confirm_reset_db,
-                        style=ft.ButtonStyle(bgcolor=AppTheme.TEXT_ERROR, color=AppTheme.BTN_TEXT)
-                    ),
-                    ft.Text("⚠️ Esta acción eliminará todos los datos", size=12, color=AppTheme.TEXT_ERROR)
-                ]
-            ),
-            ft.Container(height=20),
-            
-            build_section(
-                "Acerca de", "Información de la aplicación",
-                [
-                    ft.Text("Barber Manager v1.0.0", size=14),
-                    ft.Text("Aplicación de gestión para barberías", size=12, color=AppTheme.TEXT_SECONDARY),
-                    ft.Text("Desarrollado con Flet + SQLAlchemy", size=12, color=AppTheme.TEXT_SECONDARY)
-                ]
-            )
+            *sections
         ],
         expand=True,
         scroll=ft.ScrollMode.AUTO
     )
+    setattr(page, _VIEW_ATTR, (view, show_saved_hours))
+    return view